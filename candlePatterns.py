@@ -13,15 +13,17 @@ library("BjCandlePatterns", overlay=true)
 // ------> Candle Measurements <----- //
 // ================================== //
 
-topWickSize         = math.abs  (math.max( close, open) - high)
-bottomWickSize      = math.abs  (math.min( close, open) - low)
-bodySize            = math.abs           ( close -open)
 bodyHigh            = math.max           ( close, open)
 bodyLow             = math.min           ( close, open)
-candleSize          = math.abs           ( high  -low)
+topWickSize         = high               - bodyHigh
+bottomWickSize      = bodyLow            - low
+bodySize            = bodyHigh           - bodyLow
+candleSize          = high               - low
+candleSizePct       = candleSize         * 0.01
 bodyAvg             = ta.ema             ( bodySize, 14)
 tallBody            = bodySize           > bodyAvg
 shortBody           = bodySize           < bodyAvg
+neckTol             = bodyAvg            * 0.05
 bodyPcnt            = bodySize           / candleSize * 100
 topShadow           = topWickSize        > 5 / 100 * bodySize
 bottomShadow        = bottomWickSize     > 5 / 100 * bodySize
@@ -33,6 +35,104 @@ dwnGap              = low[1] > high
 bodyIsDoji          = bodyPcnt <= 5
 upCandle            = close > open
 dwnCandle           = close < open
+tallBodyPrev        = tallBody[1]
+dojiPrev            = bodyIsDoji[1]
+upCandlePrev        = upCandle[1]
+dwnCandlePrev       = dwnCandle[1]
+nonZeroBar          = candleSize != 0
+isInside            = high < high[1] and low > low[1]
+
+// ================================== //
+// ---------> Label Tooltips <------- //
+// ================================== //
+
+const string DOJI_TIP              = "Doji\nTransitional candle signifying equality or indecision with a small or non-existent real body as the session closes at or near its open"
+const string BULL_ENGULF_TIP       = "Bullish Engulfing\nAn up candle that closes higher than the previous day's opening after opening lower than the previous day's close"
+const string BEAR_ENGULF_TIP       = "Bearish Engulfing\nA down candle that closes lower than the previous day's opening after opening higher than the previous day's close"
+const string HAMMER_TIP            = "Hammer\nBullish bottoming candle comprised of a long lower wick and small real body typically closing at or near the highs"
+const string STAR_TIP              = "Shooting Star\nBearish topping candle comprised of a long upper wick and small real body typically closing at or near the lows"
+const string DRAGONFLY_DOJI_TIP    = "Dragonfly Doji\nThis bullish doji varietal is defined by an open and a close at or near the highs of the bar"
+const string GRAVESTONE_DOJI_TIP   = "Gravestone Doji\nThis bearish doji varietal is defined by an open and a close at or near the lows of the bar"
+const string TWEEZER_BOTTOM_TIP    = "Tweezer Bottom\nAn up candle following a down candle in a downtrend who's lows are nearly identical. The defence of the double bottom and a push to close green can show bulls are ready to fight back and can signal reversal"
+const string TWEEZER_TOP_TIP       = "TweezerTop\nA down candle following an up candle in a uptrend who's highs are nearly identical. The defence of the double top and a push to close red can show bears are ready to fight back and can signal reversal"
+const string SPINNING_TOP_BULL_TIP = "Bullish Spinning Top\nAn up candle defined by a short body surrounded by long wicks of approximately the same length as one another with each wick greater than the size of the body. Typical sign of indecision and possible reversal when observed at the swing low, or continuation sign if price breaks beyond the swing point"
+const string SPINNING_TOP_BEAR_TIP = "Bearish Spinning Top\nA down candle defined by a short body surrounded by long wicks of approximately the same length as one another with each wick greater than the size of the body. Typical sign of indecision and possible reversal when observed at the swing high, or continuation sign if price breaks beyond the swing point"
+const string SPINNING_TOP_TIP      = "Spinning Top\nA candle defined by a short body surrounded by long wicks of approximately the same length as one another with each wick greater than the size of the body. Typical sign of indecision and possible reversal when observed at the swing high/low, or continuation sign if price breaks above/below the candle low"
+const string MORNING_STAR_TIP      = "Bullish Morning Star\nThe morning star is a 3 bar bullish candlestick pattern that is formed during a downward trend. A small indecsion candle separates a first decisive down move, ending with a strong move in the opposite direction signaling possible reversal"
+const string EVENING_STAR_TIP      = "Bearish Evening Star\nThe evening star is a 3 bar bullish candlestick pattern that is formed during an upward trend. A small indecsion candle separates a first decisive up move, ending with a strong move in the opposite direction signaling possible reversal"
+const string HARAMI_BULL_TIP       = "Bullish Harami\nThis 2 bar bullish pattern consists of a small-bodied green candle that is entirely encompassed within the body of what was once a red-bodied candle."
+const string HARAMI_BEAR_TIP       = "Bearish Harami\nThis 2 bar bearish pattern consists of a small-bodied red candle that is entirely encompassed within the body of what was once a green-bodied candle."
+const string HARAMI_BULL_CROSS_TIP = "Bullish Harami Cross\nFound during a downtrend, this Harami variation consists of a Doji candle that is entirely encompassed within the body of what was once a red-bodied candle, signaling possible reversal"
+const string HARAMI_BEAR_CROSS_TIP = "Bearish Harami Cross\nFound during an uptrend, this Harami variation consists of a Doji candle that is entirely encompassed within the body of what was once a green-bodied candle, signaling possible reversal"
+const string MARUBULLZU_TIP        = "Bullish Marubozu\nA bullish candlestick that does not have a shadow that extends from its candle body at either the open or the close"
+const string MARUBEARZU_TIP        = "Bearish Marubozu\nA bearish candlestick that does not have a shadow that extends from its candle body at either the open or the close"
+const string ABANDONED_BULL_TIP    = "Bullish Abandoned Baby\nA bullish reversal pattern where first is a large down candle, followed by a doji candle that gaps below the first candle. The next candle opens higher than the doji and moves aggressively to the upside."
+const string ABANDONED_BEAR_TIP    = "Bearish Abandoned Baby\nA bearish reversal pattern where first is a large up candle, followed by a doji candle that gaps above the first candle. The next candle opens lower than the doji and moves aggressively to the downside."
+const string PIERCING_TIP          = "Piercing\nA two-candle bullish reversal candlestick pattern found in a downtrend. The first candle is red and has a larger than average body. The second candle is green and opens below the low of the prior candle, creating a gap, and then closes above the midpoint of the first candle."
+const string DARK_CLOUD_COVER_TIP  = "Dark Cloud Cover\nA two-candle bearish reversal candlestick pattern found in an uptrend. The first candle is green and has a larger than average body. The second candle is red and opens above the high of the prior candle, creating a gap, and then closes below the midpoint of the first candle."
+const string TASUKI_BULL_TIP       = "Upside Tasuki Gap\nA three-candle pattern found in an uptrend that usually hints at the continuation of the uptrend. The first candle is long and green, followed by a smaller green candle with its opening price that gaps above the body of the previous candle. The third candle is red and it closes inside the gap created by the first two candles, unable to close it fully."
+const string TASUKI_BEAR_TIP       = "Downside Tasuki Gap\nA three-candle pattern found in a downtrend that usually hints at the continuation of the downtrend. The first candle is long and red, followed by a smaller red candle with its opening price that gaps below the body of the previous candle. The third candle is green and it closes inside the gap created by the first two candles, unable to close it fully."
+const string RISING_THREE_TIP      = "Rising Three Methods\nA five-candle bullish pattern that signifies a continuation of an existing uptrend. The first candle is long and green, followed by three short red candles with bodies inside the range of the first candle. The last candle is also green and long and it closes above the close of the first candle."
+const string FALLING_THREE_TIP     = "FallingThree\nA five-candle bearish pattern that signifies a continuation of an existing downtrend. The first candle is long and red, followed by three short green candles with bodies inside the range of the first candle. The last candle is also red and long and it closes below the close of the first candle."
+const string RISING_WINDOW_TIP     = "Rising Window\nA two-candle bullish continuation pattern that forms during an uptrend. The most important characteristic of the pattern is a price gap between the first candle's high and the second candle's low."
+const string FALLING_WINDOW_TIP    = "Falling Window\nA two-candle bearish continuation pattern that forms during a downtrend. The most important characteristic of the pattern is a price gap between the first candle's low and the second candle's high."
+const string KICKING_BULL_TIP      = "Kicking\nThe first day candlestick is a bearish marubozu candlestick with next to no upper or lower shadow and where the price opens at the day’s high and closes at the day’s low. The second day is a bullish marubozu pattern, with next to no upper or lower shadow and where the price opens at the day’s low and closes at the day’s high"
+const string KICKING_BEAR_TIP      = "Kicking\nThe first day candlestick is a bullish marubozu candlestick with next to no upper or lower shadow and where the price opens at the day’s low and closes at the day’s high. The second day is a bearish marubozu pattern, with next to no upper or lower shadow and where the price opens at the day’s high and closes at the day’s low"
+const string LLS_TIP               = "Long Lower Shadow\nTo indicate seller domination of the first part of a session, candlesticks will present with long lower shadows, as well as short upper shadows, which leaves sellers underwater by candles end"
+const string LUS_TIP               = "Long Upper Shadow\nTo indicate buyer domination of the first part of a session, candlesticks will present with long upper shadows, as well as short lower shadows, which leaves buyers underwater by candles end"
+const string BULL_NECK_TIP         = "On Neck - Bullsih\nOn Neck is a two-line continuation pattern found in a uptrend. The first candle is long and green, the second candle is short and has a red body. The closing price of the second candle is close or equal to the first candle's high price. Hints at continuation of trend"
+const string BEAR_NECK_TIP         = "On Neck - Bearish\nOn Neck is a two-line continuation pattern found in a downtrend. The first candle is long and red, the second candle is short and has a green body. The closing price of the second candle is close or equal to the first candle's low price. Hints at continuation of trend"
+const string SOLDIERS_TIP          = "Three White Soldiers\nThis bullish reversal pattern is made up of three long-bodied, green candles in immediate succession. Each one opens within the body before it and the close is near to the high."
+const string CROWS_TIP             = "Three Black Crows\nThis is a bearish reversal pattern that consists of three long, red-bodied candles in immediate succession. For each of these candles, each day opens within the body of the day before and closes either at or near its low."
+const string TRI_STAR_BULL_TIP     = "Tri-Star Bull\nA bullish TriStar pattern can form when three doji candlesticks materialize in immediate succession at the tail-end of an extended downtrend. The first doji candle marks indecision between bull and bear. The second doji gaps in the direction of the leading trend. The third changes the attitude of the market once the candlestick opens in the direction opposite to the trend."
+const string TRI_STAR_BEAR_TIP     = "Tri-Star Bear\nA bearish TriStar pattern can form when three doji candlesticks materialize in immediate succession at the tail-end of an extended uptrend. The first doji candle marks indecision between bull and bear. The second doji gaps in the direction of the leading trend. The third changes the attitude of the market once the candlestick opens in the direction opposite to the trend."
+const string INSIDE_BAR_TIP        = 'Inside Bar\nAn “inside bar” pattern is a two-bar price action trading strategy in which the inside bar is smaller and within the high to low range of the prior bar, i.e. the high is lower than the previous bar’s high, and the low is higher than the previous bar’s low.'
+const string DOUBLE_INSIDE_TIP     = "Double Inside Bar\nA 'Double Inside' pattern is a 3 bar pattern where 2 inside bars occur in a row. Often seen in consolidation or 'flag' patterns. The pattern typically favors continuation."
+
+// pattern ids, also the bit positions of patternsMask()
+const int ID_DOJI              = 0
+const int ID_BULL_ENGULF       = 1
+const int ID_BEAR_ENGULF       = 2
+const int ID_HAMMER            = 3
+const int ID_STAR              = 4
+const int ID_DRAGONFLY_DOJI    = 5
+const int ID_GRAVESTONE_DOJI   = 6
+const int ID_TWEEZER_BOTTOM    = 7
+const int ID_TWEEZER_TOP       = 8
+const int ID_SPINNING_TOP_BULL = 9
+const int ID_SPINNING_TOP_BEAR = 10
+const int ID_SPINNING_TOP      = 11
+const int ID_MORNING_STAR      = 12
+const int ID_EVENING_STAR      = 13
+const int ID_HARAMI_BULL       = 14
+const int ID_HARAMI_BEAR       = 15
+const int ID_HARAMI_BULL_CROSS = 16
+const int ID_HARAMI_BEAR_CROSS = 17
+const int ID_MARUBULLZU        = 18
+const int ID_MARUBEARZU        = 19
+const int ID_ABANDONED_BULL    = 20
+const int ID_ABANDONED_BEAR    = 21
+const int ID_PIERCING          = 22
+const int ID_DARK_CLOUD_COVER  = 23
+const int ID_TASUKI_BULL       = 24
+const int ID_TASUKI_BEAR       = 25
+const int ID_RISING_THREE      = 26
+const int ID_FALLING_THREE     = 27
+const int ID_RISING_WINDOW     = 28
+const int ID_FALLING_WINDOW    = 29
+const int ID_KICKING_BULL      = 30
+const int ID_KICKING_BEAR      = 31
+const int ID_LLS               = 32
+const int ID_LUS               = 33
+const int ID_BULL_NECK         = 34
+const int ID_BEAR_NECK         = 35
+const int ID_SOLDIERS          = 36
+const int ID_CROWS             = 37
+const int ID_TRI_STAR_BULL     = 38
+const int ID_TRI_STAR_BEAR     = 39
+const int ID_INSIDE_BAR        = 40
+const int ID_DOUBLE_INSIDE     = 41
+
 
 // ================================== //
 // ---> Functional Declarations <---- //
@@ -44,17 +144,20 @@ dwnCandle           = close < open
 // @returns             (series bool) True when pattern detected
 export doji(float dojiSize = 5.0, float dojiWickSize = 2.0) =>
 	calcDoji        = topWickSize <= bottomWickSize * dojiWickSize and bottomWickSize <= topWickSize * dojiWickSize
-    result          = bodyPcnt <= dojiSize and calcDoji
+    bodyPcnt <= dojiSize and calcDoji
+
+// default doji() series, shared by the patterns made of consecutive dojis
+isDoji              = doji()
  
 // @function            Produces "Doji" identifier label 
 // @param showLabel     (series bool) Shows label when input is true. Default is false
 // @param labelColor    (series color) Color of the label border and arrow
 // @param textColor     (series color) Text color
+// @param patternDetected (series bool) Draws the label only on bars where the pattern is detected. Default is true
 // @returns             (label) A label visible at the chart level intended for the title pattern   
-export dLab(bool showLabel = false, color labelColor = color.gray, color textColor = color.white) =>
-    if showLabel
-        var dojiTip = "Doji\nTransitional candle signifying equality or indecision with a small or non-existent real body as the session closes at or near its open"
-        label.new(bar_index, na, text="D", yloc = yloc.belowbar, color = labelColor,  style = label.style_label_up, textcolor = textColor, tooltip = dojiTip)
+export dLab(bool showLabel = false, color labelColor = color.gray, color textColor = color.white, bool patternDetected = true) =>
+    if showLabel and patternDetected
+        label.new(bar_index, na, text="D", yloc = yloc.belowbar, color = labelColor,  style = label.style_label_up, textcolor = textColor, tooltip = DOJI_TIP)
 
 // @function            Detects "Bullish Engulfing" candle patterns
 // @param maxRejectWick (float) Maximum rejection wick size. 
@@ -63,18 +166,18 @@ export dLab(bool showLabel = false, color labelColor = color.gray, color textCol
 // @param mustEngulfWick (bool) input to only detect setups that close above the high prior effectively engulfing the candle in its entirety. Default is false
 // @returns             (series bool) True when pattern detected 
 export bullEngulf(float maxRejectWick = 0.0, bool mustEngulfWick = false) =>
-    rejectionRule   = maxRejectWick == 0.0 or topWickSize / bodySize < (maxRejectWick / 100)
-    result          = close[1] <= open[1] and close >= open[1] and open <= close[1] and rejectionRule and (not mustEngulfWick or close >= high[1]) and bodySize > 0
+    rejectionRule   = maxRejectWick == 0.0 or topWickSize * 100 < maxRejectWick * bodySize
+    close[1] <= open[1] and close >= open[1] and open <= close[1] and rejectionRule and (not mustEngulfWick or close >= high[1]) and bodySize > 0
 
 // @function            Produces "Bullish Engulfing" identifier label
 // @param showLabel     (series bool) Shows label when input is true. Default is false
 // @param labelColor    (series color) Color of the label border and arrow
 // @param textColor     (series color) Text color
+// @param patternDetected (series bool) Draws the label only on bars where the pattern is detected. Default is true
 // @returns             (label) A label visible at the chart level intended for the title pattern   
-export bewLab(bool showLabel = false, color labelColor = #64b5f6, color textColor = color.white) =>
-    if showLabel
-        var engulfingTip = "Bullish Engulfing\nAn up candle that closes higher than the previous day's opening after opening lower than the previous day's close"
-        label.new(bar_index, na, text="BE", yloc = yloc.belowbar, color = labelColor, style = label.style_label_up, textcolor = textColor, tooltip = engulfingTip)
+export bewLab(bool showLabel = false, color labelColor = #64b5f6, color textColor = color.white, bool patternDetected = true) =>
+    if showLabel and patternDetected
+        label.new(bar_index, na, text="BE", yloc = yloc.belowbar, color = labelColor, style = label.style_label_up, textcolor = textColor, tooltip = BULL_ENGULF_TIP)
     
 // @function            Detects "Bearish Engulfing" candle patterns
 // @param maxRejectWick (float) Maximum rejection wick size. 
@@ -83,18 +186,18 @@ export bewLab(bool showLabel = false, color labelColor = #64b5f6, color textColo
 // @param mustEngulfWick (bool) Input to only detect setups that close below the low prior effectively engulfing the candle in its entirety. Default is false
 // @returns             (series bool) True when pattern detected 
 export bearEngulf(float maxRejectWick = 0.0, bool mustEngulfWick = false) =>
-    rejectionRule   = maxRejectWick == 0.0 or bottomWickSize / bodySize < (maxRejectWick / 100)
-	result          = close[1] >= open[1] and close <= open[1] and open >= close[1] and rejectionRule and (not mustEngulfWick or close <= low[1]) and bodySize > 0
+    rejectionRule   = maxRejectWick == 0.0 or bottomWickSize * 100 < maxRejectWick * bodySize
+	close[1] >= open[1] and close <= open[1] and open >= close[1] and rejectionRule and (not mustEngulfWick or close <= low[1]) and bodySize > 0
 
 // @function            Produces "Bearish Engulfing" identifier label
 // @param showLabel     (series bool) Shows label when input is true. Default is false
 // @param labelColor    (series color) Color of the label border and arrow
 // @param textColor     (series color) Text color
+// @param patternDetected (series bool) Draws the label only on bars where the pattern is detected. Default is true
 // @returns             (label) A label visible at the chart level intended for the title pattern   
-export bebLab(bool showLabel = false, color labelColor = #ef5350, color textColor = color.white) =>
-    if showLabel
-        var EngulfingTip = "Bearish Engulfing\nA down candle that closes lower than the previous day's opening after opening higher than the previous day's close"
-        label.new(bar_index, na, text = "BE",  yloc = yloc.abovebar, color = labelColor, style = label.style_label_down, textcolor = textColor, tooltip = EngulfingTip)
+export bebLab(bool showLabel = false, color labelColor = #ef5350, color textColor = color.white, bool patternDetected = true) =>
+    if showLabel and patternDetected
+        label.new(bar_index, na, text = "BE",  yloc = yloc.abovebar, color = labelColor, style = label.style_label_down, textcolor = textColor, tooltip = BEAR_ENGULF_TIP)
     
 // @function            Detects "Hammer" candle patterns
 // @param ratio         (float) The relationship of body to candle size (ie. body is 33% of total candle size). Default is 33%.
@@ -103,17 +206,17 @@ export bebLab(bool showLabel = false, color labelColor = #ef5350, color textColo
 export hammer(float ratio = 33, float shadowPercent = 5.0) =>
 	bullRatio       = (low - high) * (ratio/100) + high 
 	hasShadow       = topWickSize > shadowPercent / 100 * bodySize
-	result          = bodySize > 0 and bodyLow >= bullRatio and not hasShadow
+	bodySize > 0 and bodyLow >= bullRatio and not hasShadow
     
 // @function            Produces "Hammer" identifier label
 // @param showLabel     (series bool) Shows label when input is true. Default is false
 // @param labelColor    (series color) Color of the label border and arrow
 // @param textColor     (series color) Text color
+// @param patternDetected (series bool) Draws the label only on bars where the pattern is detected. Default is true
 // @returns             (label) A label visible at the chart level intended for the title pattern   
-export hLab(bool showLabel = false, color labelColor = #64b5f6, color textColor = color.white) =>
-    if showLabel
-        var HammerTip = "Hammer\nBullish bottoming candle comprised of a long lower wick and small real body typically closing at or near the highs"
-        label.new(bar_index, na, text="H",  yloc = yloc.belowbar, color = labelColor, style = label.style_label_up, textcolor = textColor, tooltip = HammerTip)
+export hLab(bool showLabel = false, color labelColor = #64b5f6, color textColor = color.white, bool patternDetected = true) =>
+    if showLabel and patternDetected
+        label.new(bar_index, na, text="H",  yloc = yloc.belowbar, color = labelColor, style = label.style_label_up, textcolor = textColor, tooltip = HAMMER_TIP)
     
 // @function            Detects "Star" candle patterns
 // @param ratio         (float) The relationship of body to candle size (ie. body is 33% of total candle size). Default is 33%.
@@ -122,590 +225,685 @@ export hLab(bool showLabel = false, color labelColor = #64b5f6, color textColor
 export star(float ratio = 33, float shadowPercent = 5.0) =>
     bearRatio       = (high - low) * (ratio/100) + low 
     hasShadow       = bottomWickSize > shadowPercent / 100 * bodySize
-	result          = bodySize > 0 and bodyHigh <= bearRatio and not hasShadow
+	bodySize > 0 and bodyHigh <= bearRatio and not hasShadow
 	
 // @function            Produces "Star" identifier label
 // @param showLabel     (series bool) Shows label when input is true. Default is false
 // @param labelColor    (series color) Color of the label border and arrow
 // @param textColor     (series color) Text color
+// @param patternDetected (series bool) Draws the label only on bars where the pattern is detected. Default is true
 // @returns             (label) A label visible at the chart level intended for the title pattern   
-export ssLab(bool showLabel = false, color labelColor = #ef5350, color textColor = color.white) =>
-    if showLabel
-        var StarTip = "Shooting Star\nBearish topping candle comprised of a long upper wick and small real body typically closing at or near the lows"
-        label.new(bar_index, na, text = "SS", yloc = yloc.abovebar, color = labelColor, style = label.style_label_down,  textcolor = textColor, tooltip = StarTip)
+export ssLab(bool showLabel = false, color labelColor = #ef5350, color textColor = color.white, bool patternDetected = true) =>
+    if showLabel and patternDetected
+        label.new(bar_index, na, text = "SS", yloc = yloc.abovebar, color = labelColor, style = label.style_label_down,  textcolor = textColor, tooltip = STAR_TIP)
 
 // @function            Detects "Dragonfly Doji" candle patterns
 // @returns             (series bool) True when pattern detected 
 export dragonflyDoji() =>
-    result          = bodyIsDoji  and topWickSize <= bodySize
+    bodyIsDoji  and topWickSize <= bodySize
     
 // @function            Produces "Dragonfly Doji" identifier label
 // @param showLabel     (series bool) Shows label when input is true. Default is false
 // @param labelColor    (series color) Color of the label border and arrow
+// @param patternDetected (series bool) Draws the label only on bars where the pattern is detected. Default is true
 // @returns             (label) A label visible at the chart level intended for the title pattern   
-export ddLab(bool showLabel = false, color labelColor = #64b5f6, color textColor = color.white) =>
-    if showLabel
-        var DragonflyDoji = "Dragonfly Doji\nThis bullish doji varietal is defined by an open and a close at or near the highs of the bar"
-        label.new(bar_index, na, text="DD", yloc = yloc.belowbar, color = labelColor, style = label.style_label_up, textcolor = textColor, tooltip = DragonflyDoji)
+export ddLab(bool showLabel = false, color labelColor = #64b5f6, color textColor = color.white, bool patternDetected = true) =>
+    if showLabel and patternDetected
+        label.new(bar_index, na, text="DD", yloc = yloc.belowbar, color = labelColor, style = label.style_label_up, textcolor = textColor, tooltip = DRAGONFLY_DOJI_TIP)
 
 // @function            Detects "Gravestone Doji" candle patterns
 // @returns             (series bool) True when pattern detected 
 export gravestoneDoji() =>
-    result          = bodyIsDoji  and topWickSize <= bodySize
+    bodyIsDoji  and bottomWickSize <= bodySize
     
 // @function            Produces "Gravestone Doji" identifier label
 // @param showLabel     (series bool) Shows label when input is true. Default is false
 // @param labelColor    (series color) Color of the label border and arrow
 // @param textColor     (series color) Text color
+// @param patternDetected (series bool) Draws the label only on bars where the pattern is detected. Default is true
 // @returns             (label) A label visible at the chart level intended for the title pattern   
-export gdLab(bool showLabel = false, color labelColor = #ef5350, color textColor = color.white) =>
-    if showLabel
-        var GravestoneDoji = "Gravestone Doji\nThis bearish doji varietal is defined by an open and a close at or near the lows of the bar"
-        label.new(bar_index, na, text="GD", yloc = yloc.abovebar, color = labelColor, style = label.style_label_down, textcolor = textColor, tooltip = GravestoneDoji)
+export gdLab(bool showLabel = false, color labelColor = #ef5350, color textColor = color.white, bool patternDetected = true) =>
+    if showLabel and patternDetected
+        label.new(bar_index, na, text="GD", yloc = yloc.abovebar, color = labelColor, style = label.style_label_down, textcolor = textColor, tooltip = GRAVESTONE_DOJI_TIP)
 
 // @function            Detects "Tweezer Bottom" candle patterns
 // @param               closeUpperHalf (bool) input to only detect setups that close above the mid-point of the candle prior increasing its bullish tendancy. Default is false
 // @returns             (series bool) True when pattern detected 
 export tweezerBottom(bool closeUpperHalf = false) =>
     upperHalf       = close > hl2[1]
-    result          = (not bodyIsDoji  or (topShadow and bottomShadow)) and math.abs(low-low[1]) <= bodyAvg*0.05 and dwnCandle[1] and upCandle and tallBody[1] and (not closeUpperHalf or (closeUpperHalf and upperHalf))
+    (not bodyIsDoji  or (topShadow and bottomShadow)) and math.abs(low-low[1]) <= bodyAvg*0.05 and dwnCandlePrev and upCandle and tallBodyPrev and (not closeUpperHalf or (closeUpperHalf and upperHalf))
     
 // @function            Produces "Tweezer Bottom" identifier label
 // @param showLabel     (series bool) Shows label when input is true. Default is false
 // @param labelColor    (series color) Color of the label border and arrow
 // @param textColor     (series color) Text color
+// @param patternDetected (series bool) Draws the label only on bars where the pattern is detected. Default is true
 // @returns             (label) A label visible at the chart level intended for the title pattern   
-export tbLab(bool showLabel = false, color labelColor = #64b5f6, color textColor = color.white) =>
-    if showLabel
-        var TweezerBottom = "Tweezer Bottom\nAn up candle following a down candle in a downtrend who's lows are nearly identical. The defence of the double bottom and a push to close green can show bulls are ready to fight back and can signal reversal"
-        label.new(bar_index, na, text="TB", yloc = yloc.belowbar, color = labelColor, style = label.style_label_up, textcolor = textColor, tooltip = TweezerBottom)
+export tbLab(bool showLabel = false, color labelColor = #64b5f6, color textColor = color.white, bool patternDetected = true) =>
+    if showLabel and patternDetected
+        label.new(bar_index, na, text="TB", yloc = yloc.belowbar, color = labelColor, style = label.style_label_up, textcolor = textColor, tooltip = TWEEZER_BOTTOM_TIP)
 
 // @function            Detects "TweezerTop" candle patterns
 // @param closeLowerHalf (bool) input to only detect setups that close below the mid-point of the candle prior increasing its bearish tendancy. Default is false
 // @returns             (series bool) True when pattern detected 
 export tweezerTop(bool closeLowerHalf = false) =>
     lowerHalf       = close < hl2[1]
-    result          = (not bodyIsDoji  or (topShadow and bottomShadow)) and math.abs(high-high[1]) <= bodyAvg*0.05 and upCandle[1] and dwnCandle and tallBody[1] and (not closeLowerHalf or (closeLowerHalf and lowerHalf))
+    (not bodyIsDoji  or (topShadow and bottomShadow)) and math.abs(high-high[1]) <= bodyAvg*0.05 and upCandlePrev and dwnCandle and tallBodyPrev and (not closeLowerHalf or (closeLowerHalf and lowerHalf))
     
 // @function            Produces "TweezerTop" identifier label
 // @param showLabel     (series bool) Shows label when input is true. Default is false
 // @param labelColor    (series color) Color of the label border and arrow
 // @param textColor     (series color) Text color
+// @param patternDetected (series bool) Draws the label only on bars where the pattern is detected. Default is true
 // @returns             (label) A label visible at the chart level intended for the title pattern   
-export ttLab(bool showLabel = false, color labelColor = #ef5350, color textColor = color.white) =>
-    if showLabel
-        var TweezerTop = "TweezerTop\nA down candle following an up candle in a uptrend who's highs are nearly identical. The defence of the double top and a push to close red can show bears are ready to fight back and can signal reversal"
-        label.new(bar_index, na, text="TT", yloc = yloc.abovebar, color = labelColor, style = label.style_label_down, textcolor = textColor, tooltip = TweezerTop)
+export ttLab(bool showLabel = false, color labelColor = #ef5350, color textColor = color.white, bool patternDetected = true) =>
+    if showLabel and patternDetected
+        label.new(bar_index, na, text="TT", yloc = yloc.abovebar, color = labelColor, style = label.style_label_down, textcolor = textColor, tooltip = TWEEZER_TOP_TIP)
 
 // @function            Detects "Bullish Spinning Top" candle patterns
 // @param wickSize      (float) input to adjust detection of the size of the top wick/ bottom wick as a percent of total candle size. Default is 34%, which ensures the wicks are both larger than the body. 
 // @returns             (series bool) True when pattern detected 
 export spinningTopBull(float wickSize = 34) =>
-    result          = bottomWickSize >= candleSize / 100 * wickSize and topWickSize >= candleSize / 100 * wickSize and upCandle and not bodyIsDoji 
+    bottomWickSize >= candleSize / 100 * wickSize and topWickSize >= candleSize / 100 * wickSize and upCandle and not bodyIsDoji 
     
 // @function            Produces "Bullish Spinning Top" identifier label
 // @param showLabel     (series bool) Shows label when input is true. Default is false
 // @param labelColor    (series color) Color of the label border and arrow
 // @param textColor     (series color) Text color
+// @param patternDetected (series bool) Draws the label only on bars where the pattern is detected. Default is true
 // @returns             (label) A label visible at the chart level intended for the title pattern   
-export stwLab(bool showLabel = false, color labelColor = color.gray, color textColor = color.white) =>
-    if showLabel
-        var SpinningTop = "Bullish Spinning Top\nAn up candle defined by a short body surrounded by long wicks of approximately the same length as one another with each wick greater than the size of the body. Typical sign of indecision and possible reversal when observed at the swing low, or continuation sign if price breaks beyond the swing point"
-        label.new(bar_index, na, text="STW", yloc = yloc.belowbar, color = labelColor, style = label.style_label_up, textcolor = textColor, tooltip = SpinningTop)
+export stwLab(bool showLabel = false, color labelColor = color.gray, color textColor = color.white, bool patternDetected = true) =>
+    if showLabel and patternDetected
+        label.new(bar_index, na, text="STW", yloc = yloc.belowbar, color = labelColor, style = label.style_label_up, textcolor = textColor, tooltip = SPINNING_TOP_BULL_TIP)
 
 // @function            Detects "Bearish Spinning Top" candle patterns
 // @param wickSize      (float) input to adjust detection of the size of the top wick/ bottom wick as a percent of total candle size. Default is 34%, which ensures the wicks are both larger than the body. 
 // @returns             (series bool) True when pattern detected 
 export spinningTopBear(float wickSize = 34) =>
-    result          = bottomWickSize >= candleSize / 100 * wickSize and topWickSize >= candleSize / 100 * wickSize and dwnCandle and not bodyIsDoji 
+    bottomWickSize >= candleSize / 100 * wickSize and topWickSize >= candleSize / 100 * wickSize and dwnCandle and not bodyIsDoji 
 
 // @function            Produces "Bearish Spinning Top" identifier label
 // @param showLabel     (series bool) Shows label when input is true. Default is false
 // @param labelColor    (series color) Color of the label border and arrow
 // @param textColor     (series color) Text color
+// @param patternDetected (series bool) Draws the label only on bars where the pattern is detected. Default is true
 // @returns             (label) A label visible at the chart level intended for the title pattern   
-export stbLab(bool showLabel = false, color labelColor = color.gray, color textColor = color.white) =>
-    if showLabel
-        var SpinningTop = "Bearish Spinning Top\nA down candle defined by a short body surrounded by long wicks of approximately the same length as one another with each wick greater than the size of the body. Typical sign of indecision and possible reversal when observed at the swing high, or continuation sign if price breaks beyond the swing point"
-        label.new(bar_index, na, text="STB", yloc = yloc.belowbar, color = labelColor, style = label.style_label_up, textcolor = textColor, tooltip = SpinningTop)
+export stbLab(bool showLabel = false, color labelColor = color.gray, color textColor = color.white, bool patternDetected = true) =>
+    if showLabel and patternDetected
+        label.new(bar_index, na, text="STB", yloc = yloc.belowbar, color = labelColor, style = label.style_label_up, textcolor = textColor, tooltip = SPINNING_TOP_BEAR_TIP)
 
 // @function            Detects "Spinning Top" candle patterns
 // @param wickSize      (float) input to adjust detection of the size of the top wick/ bottom wick as a percent of total candle size. Default is 34%, which ensures the wicks are both larger than the body. 
 // @returns             (series bool) True when pattern detected 
 export spinningTop(float wickSize = 34) =>
-    result          = bottomWickSize >= candleSize / 100 * wickSize and topWickSize >= candleSize / 100 * wickSize and not bodyIsDoji 
+    bottomWickSize >= candleSize / 100 * wickSize and topWickSize >= candleSize / 100 * wickSize and not bodyIsDoji 
 
 // @function            Produces "Spinning Top" identifier label
 // @param showLabel     (series bool) Shows label when input is true. Default is false
 // @param labelColor    (series color) Color of the label border and arrow
 // @param textColor     (series color) Text color
+// @param patternDetected (series bool) Draws the label only on bars where the pattern is detected. Default is true
 // @returns             (label) A label visible at the chart level intended for the title pattern   
-export stLab(bool showLabel = false, color labelColor = color.gray, color textColor = color.white) =>
-    if showLabel
-        var SpinningTop = "Spinning Top\nA candle defined by a short body surrounded by long wicks of approximately the same length as one another with each wick greater than the size of the body. Typical sign of indecision and possible reversal when observed at the swing high/low, or continuation sign if price breaks above/below the candle low"
-        label.new(bar_index, na, text="ST", yloc = yloc.belowbar, color = labelColor, style = label.style_label_up, textcolor = textColor, tooltip = SpinningTop)
+export stLab(bool showLabel = false, color labelColor = color.gray, color textColor = color.white, bool patternDetected = true) =>
+    if showLabel and patternDetected
+        label.new(bar_index, na, text="ST", yloc = yloc.belowbar, color = labelColor, style = label.style_label_up, textcolor = textColor, tooltip = SPINNING_TOP_TIP)
 
 // @function            Detects "Bullish Morning Star" candle patterns
 // @returns             (series bool) True when pattern detected 
 export morningStar() =>
-    result          = tallBody[2] and shortBody[1] and tallBody and dwnCandle[2] and bodyDwnGap[1] and upCandle and bodyHigh >= middleBody[2] and bodyHigh < bodyHigh[2] and bodyUpGap
+    tallBody[2] and shortBody[1] and tallBody and dwnCandle[2] and bodyDwnGap[1] and upCandle and bodyHigh >= middleBody[2] and bodyHigh < bodyHigh[2] and bodyUpGap
     
 // @function            Produces "Bullish Morning Star" identifier label
 // @param showLabel     (series bool) Shows label when input is true. Default is false
 // @param labelColor    (series color) Color of the label border and arrow
 // @param textColor     (series color) Text color
+// @param patternDetected (series bool) Draws the label only on bars where the pattern is detected. Default is true
 // @returns             (label) A label visible at the chart level intended for the title pattern   
-export msLab(bool showLabel = false, color labelColor = #64b5f6, color textColor = color.white) =>
-    if showLabel
-        var MorningStar = "Bullish Morning Star\nThe morning star is a 3 bar bullish candlestick pattern that is formed during a downward trend. A small indecsion candle separates a first decisive down move, ending with a strong move in the opposite direction signaling possible reversal"
-        label.new(bar_index, na, text="MS", yloc = yloc.belowbar, color = labelColor, style = label.style_label_up, textcolor = textColor, tooltip = MorningStar)
+export msLab(bool showLabel = false, color labelColor = #64b5f6, color textColor = color.white, bool patternDetected = true) =>
+    if showLabel and patternDetected
+        label.new(bar_index, na, text="MS", yloc = yloc.belowbar, color = labelColor, style = label.style_label_up, textcolor = textColor, tooltip = MORNING_STAR_TIP)
 
 // @function            Detects "Bearish Evening Star" candle patterns
 // @returns             (series bool) True when pattern detected 
 export eveningStar() =>
-    result          = tallBody[2] and shortBody[1] and tallBody and upCandle[2] and bodyUpGap[1] and dwnCandle and bodyLow <= middleBody[2] and bodyLow > bodyLow[2] and bodyDwnGap
+    tallBody[2] and shortBody[1] and tallBody and upCandle[2] and bodyUpGap[1] and dwnCandle and bodyLow <= middleBody[2] and bodyLow > bodyLow[2] and bodyDwnGap
     
 // @function            Produces "Bearish Evening Star" identifier label
 // @param showLabel     (series bool) Shows label when input is true. Default is false
 // @param labelColor    (series color) Color of the label border and arrow
 // @param textColor     (series color) Text color
+// @param patternDetected (series bool) Draws the label only on bars where the pattern is detected. Default is true
 // @returns             (label) A label visible at the chart level intended for the title pattern   
-export esLab(bool showLabel = false, color labelColor = #ef5350, color textColor = color.white) =>
-    if showLabel
-        var EveningStar = "Bearish Evening Star\nThe evening star is a 3 bar bullish candlestick pattern that is formed during an upward trend. A small indecsion candle separates a first decisive up move, ending with a strong move in the opposite direction signaling possible reversal"
-        label.new(bar_index, na, text="ES", yloc = yloc.abovebar, color = labelColor, style = label.style_label_down, textcolor = textColor, tooltip = EveningStar)
+export esLab(bool showLabel = false, color labelColor = #ef5350, color textColor = color.white, bool patternDetected = true) =>
+    if showLabel and patternDetected
+        label.new(bar_index, na, text="ES", yloc = yloc.abovebar, color = labelColor, style = label.style_label_down, textcolor = textColor, tooltip = EVENING_STAR_TIP)
 
 // @function            Detects "Bullish Harami" candle patterns
 // @returns             (series bool) True when pattern detected 
 export haramiBull() =>
-    result          = tallBody[1] and dwnCandle[1] and upCandle and shortBody and high <= bodyHigh[1] and low >= bodyLow[1]
+    tallBodyPrev and dwnCandlePrev and upCandle and shortBody and high <= bodyHigh[1] and low >= bodyLow[1]
     
 // @function            Produces "Bullish Harami" identifier label
 // @param showLabel     (series bool) Shows label when input is true. Default is false
 // @param labelColor    (series color) Color of the label border and arrow
 // @param textColor     (series color) Text color
+// @param patternDetected (series bool) Draws the label only on bars where the pattern is detected. Default is true
 // @returns             (label) A label visible at the chart level intended for the title pattern   
-export hwLab(bool showLabel = false, color labelColor = #64b5f6, color textColor = color.white) =>
-    if showLabel
-        var HaramiBull = "Bullish Harami\nThis 2 bar bullish pattern consists of a small-bodied green candle that is entirely encompassed within the body of what was once a red-bodied candle."
-        label.new(bar_index, na, text="HW", yloc = yloc.belowbar, color = labelColor, style = label.style_label_up, textcolor = textColor, tooltip = HaramiBull)
+export hwLab(bool showLabel = false, color labelColor = #64b5f6, color textColor = color.white, bool patternDetected = true) =>
+    if showLabel and patternDetected
+        label.new(bar_index, na, text="HW", yloc = yloc.belowbar, color = labelColor, style = label.style_label_up, textcolor = textColor, tooltip = HARAMI_BULL_TIP)
 // @function            Detects "Bearish Harami" candle patterns
 // @returns             (series bool) True when pattern detected 
 export haramiBear() =>
-    result          =  tallBody[1] and upCandle[1] and dwnCandle and shortBody and high <= bodyHigh[1] and low >= bodyLow[1]
+    tallBodyPrev and upCandlePrev and dwnCandle and shortBody and high <= bodyHigh[1] and low >= bodyLow[1]
     
 // @function            Produces "Bearish Harami" identifier label
 // @param showLabel     (series bool) Shows label when input is true. Default is false
 // @param labelColor    (series color) Color of the label border and arrow
 // @param textColor     (series color) Text color
+// @param patternDetected (series bool) Draws the label only on bars where the pattern is detected. Default is true
 // @returns             (label) A label visible at the chart level intended for the title pattern   
-export hbLab(bool showLabel = false, color labelColor = #ef5350, color textColor = color.white) =>
-    if showLabel
-        var HaramiBear = "Bearish Harami\nThis 2 bar bearish pattern consists of a small-bodied red candle that is entirely encompassed within the body of what was once a green-bodied candle."
-        label.new(bar_index, na, text="HB", yloc = yloc.abovebar, color = labelColor, style = label.style_label_down, textcolor = textColor, tooltip = HaramiBear)
+export hbLab(bool showLabel = false, color labelColor = #ef5350, color textColor = color.white, bool patternDetected = true) =>
+    if showLabel and patternDetected
+        label.new(bar_index, na, text="HB", yloc = yloc.abovebar, color = labelColor, style = label.style_label_down, textcolor = textColor, tooltip = HARAMI_BEAR_TIP)
 
 // @function            Detects "Bullish Harami Cross" candle patterns
 // @returns             (series bool) True when pattern detected 
 export haramiBullCross() =>
-    result          = tallBody[1] and dwnCandle[1] and bodyIsDoji  and high <= bodyHigh[1] and low >= bodyLow[1]
+    tallBodyPrev and dwnCandlePrev and bodyIsDoji  and high <= bodyHigh[1] and low >= bodyLow[1]
 
 // @function            Produces "Bullish Harami Cross" identifier label
 // @param showLabel     (series bool) Shows label when input is true. Default is false
 // @param labelColor    (series color) Color of the label border and arrow
 // @param textColor     (series color) Text color
+// @param patternDetected (series bool) Draws the label only on bars where the pattern is detected. Default is true
 // @returns             (label) A label visible at the chart level intended for the title pattern   
-export hcwLab(bool showLabel = false, color labelColor = #64b5f6, color textColor = color.white) =>
-    if showLabel
-        var HaramiBullCross = "Bullish Harami Cross\nFound during a downtrend, this Harami variation consists of a Doji candle that is entirely encompassed within the body of what was once a red-bodied candle, signaling possible reversal"
-        label.new(bar_index, na, text="HC", yloc = yloc.belowbar, color = labelColor, style = label.style_label_up, textcolor = textColor, tooltip = HaramiBullCross)
+export hcwLab(bool showLabel = false, color labelColor = #64b5f6, color textColor = color.white, bool patternDetected = true) =>
+    if showLabel and patternDetected
+        label.new(bar_index, na, text="HC", yloc = yloc.belowbar, color = labelColor, style = label.style_label_up, textcolor = textColor, tooltip = HARAMI_BULL_CROSS_TIP)
 
 // @function            Detects "Bearish Harami Cross" candle patterns
 // @returns             (series bool) True when pattern detected 
 export haramiBearCross() =>
-    result          =  tallBody[1] and upCandle[1] and bodyIsDoji  and high <= bodyHigh[1] and low >= bodyLow[1]
+    tallBodyPrev and upCandlePrev and bodyIsDoji  and high <= bodyHigh[1] and low >= bodyLow[1]
     
 // @function            Produces "Bearish Harami Cross" identifier label
 // @param showLabel     (series bool) Shows label when input is true. Default is false
 // @param labelColor    (series color) Color of the label border and arrow
+// @param patternDetected (series bool) Draws the label only on bars where the pattern is detected. Default is true
 // @returns             (label) A label visible at the chart level intended for the title pattern   
-export hcbLab(bool showLabel = false, color labelColor = #ef5350, color textColor = color.white) =>
-    if showLabel
-        var HaramiBearCross = "Bearish Harami Cross\nFound during an uptrend, this Harami variation consists of a Doji candle that is entirely encompassed within the body of what was once a green-bodied candle, signaling possible reversal"
-        label.new(bar_index, na, text="HC", yloc = yloc.abovebar, color = labelColor, style = label.style_label_down, textcolor = textColor, tooltip = HaramiBearCross)
+export hcbLab(bool showLabel = false, color labelColor = #ef5350, color textColor = color.white, bool patternDetected = true) =>
+    if showLabel and patternDetected
+        label.new(bar_index, na, text="HC", yloc = yloc.abovebar, color = labelColor, style = label.style_label_down, textcolor = textColor, tooltip = HARAMI_BEAR_CROSS_TIP)
 
 // @function            Detects "Bullish Marubozu" candle patterns
 // @returns             (series bool) True when pattern detected 
 export marubullzu() =>
-    result          = upCandle and tallBody and  5 > topWickSize/ bodySize * 100 and 5 > bottomWickSize/ bodySize * 100 
+    upCandle and tallBody and  5 > topWickSize/ bodySize * 100 and 5 > bottomWickSize/ bodySize * 100 
 
 // @function            Produces "Bullish Marubozu" identifier label
 // @param               showLabel (series bool) Shows label when input is true. Default is false
 // @param labelColor    (series color) Color of the label border and arrow
 // @param textColor     (series color) Text color
+// @param patternDetected (series bool) Draws the label only on bars where the pattern is detected. Default is true
 // @returns             (label) A label visible at the chart level intended for the title pattern   
-export mwLab(bool showLabel = false, color labelColor = #64b5f6, color textColor = color.white) =>
-    if showLabel
-        var Marubullzu = "Bullish Marubozu\nA bullish candlestick that does not have a shadow that extends from its candle body at either the open or the close"
-        label.new(bar_index, na, text="MW", yloc = yloc.belowbar, color = labelColor, style = label.style_label_up, textcolor = textColor, tooltip = Marubullzu)
+export mwLab(bool showLabel = false, color labelColor = #64b5f6, color textColor = color.white, bool patternDetected = true) =>
+    if showLabel and patternDetected
+        label.new(bar_index, na, text="MW", yloc = yloc.belowbar, color = labelColor, style = label.style_label_up, textcolor = textColor, tooltip = MARUBULLZU_TIP)
 
 // @function            Detects "Bearish Marubozu" candle patterns
 // @returns             (series bool) True when pattern detected 
 export marubearzu() =>
-    result          = dwnCandle and tallBody and  5 > topWickSize/ bodySize * 100 and 5 > bottomWickSize/ bodySize * 100 
+    dwnCandle and tallBody and  5 > topWickSize/ bodySize * 100 and 5 > bottomWickSize/ bodySize * 100 
+
+// marubozu series, shared by the kicking patterns
+maruBull            = marubullzu()
+maruBear            = marubearzu()
     
 // @function            Produces "Bearish Marubozu" identifier label
 // @param showLabel     (series bool) Shows label when input is true. Default is false
 // @param labelColor    (series color) Color of the label border and arrow
 // @param textColor     (series color) Text color
+// @param patternDetected (series bool) Draws the label only on bars where the pattern is detected. Default is true
 // @returns             (label) A label visible at the chart level intended for the title pattern   
-export mbLab(bool showLabel = false, color labelColor = #ef5350, color textColor = color.white) =>
-    if showLabel
-        var Marubearzu = "Bearish Marubozu\nA bearish candlestick that does not have a shadow that extends from its candle body at either the open or the close"
-        label.new(bar_index, na, text="MB", yloc = yloc.abovebar, color = labelColor, style = label.style_label_down, textcolor = textColor, tooltip = Marubearzu)
+export mbLab(bool showLabel = false, color labelColor = #ef5350, color textColor = color.white, bool patternDetected = true) =>
+    if showLabel and patternDetected
+        label.new(bar_index, na, text="MB", yloc = yloc.abovebar, color = labelColor, style = label.style_label_down, textcolor = textColor, tooltip = MARUBEARZU_TIP)
 
 // @function            Detects "Bullish Abandoned Baby" candle patterns
 // @returns             (series bool) True when pattern detected 
 export abandonedBull() =>
-    result          = dwnCandle[2] and bodyIsDoji [1] and dwnGap[1] and upCandle and upGap
+    dwnCandle[2] and dojiPrev and dwnGap[1] and upCandle and upGap
     
 // @function            Produces "Bullish Abandoned Baby" identifier label
 // @param showLabel     (series bool) Shows label when input is true. Default is false
 // @param labelColor    (series color) Color of the label border and arrow
 // @param textColor     (series color) Text color
+// @param patternDetected (series bool) Draws the label only on bars where the pattern is detected. Default is true
 // @returns             (label) A label visible at the chart level intended for the title pattern   
-export abwLab(bool showLabel = false, color labelColor = #64b5f6, color textColor = color.white) =>
-    if showLabel
-        var AbandonedBull = "Bullish Abandoned Baby\nA bullish reversal pattern where first is a large down candle, followed by a doji candle that gaps below the first candle. The next candle opens higher than the doji and moves aggressively to the upside."
-        label.new(bar_index, na, text="AB", yloc = yloc.belowbar, color = labelColor, style = label.style_label_up, textcolor = textColor, tooltip = AbandonedBull)
+export abwLab(bool showLabel = false, color labelColor = #64b5f6, color textColor = color.white, bool patternDetected = true) =>
+    if showLabel and patternDetected
+        label.new(bar_index, na, text="AB", yloc = yloc.belowbar, color = labelColor, style = label.style_label_up, textcolor = textColor, tooltip = ABANDONED_BULL_TIP)
 
 // @function            Detects "Bearish Abandoned Baby" candle patterns
 // @returns             (series bool) True when pattern detected 
 export abandonedBear() =>
-    result          = upCandle[2] and bodyIsDoji [1] and upGap[1] and dwnCandle and dwnGap 
+    upCandle[2] and dojiPrev and upGap[1] and dwnCandle and dwnGap 
 
 // @function            Produces "Bearish Abandoned Baby" identifier label
 // @param showLabel     (series bool) Shows label when input is true. Default is false
 // @param labelColor    (series color) Color of the label border and arrow
 // @param textColor     (series color) Text color
+// @param patternDetected (series bool) Draws the label only on bars where the pattern is detected. Default is true
 // @returns             (label) A label visible at the chart level intended for the title pattern   
-export abbLab(bool showLabel = false, color labelColor = #ef5350, color textColor = color.white) =>
-    if showLabel
-        var AbandonedBear = "Bearish Abandoned Baby\nA bearish reversal pattern where first is a large up candle, followed by a doji candle that gaps above the first candle. The next candle opens lower than the doji and moves aggressively to the downside."
-        label.new(bar_index, na, text="AB", yloc = yloc.abovebar, color = labelColor, style = label.style_label_down, textcolor = textColor, tooltip = AbandonedBear)
+export abbLab(bool showLabel = false, color labelColor = #ef5350, color textColor = color.white, bool patternDetected = true) =>
+    if showLabel and patternDetected
+        label.new(bar_index, na, text="AB", yloc = yloc.abovebar, color = labelColor, style = label.style_label_down, textcolor = textColor, tooltip = ABANDONED_BEAR_TIP)
 
 // @function            Detects "Piercing" candle patterns
 // @returns             (series bool) True when pattern detected 
 export piercing() =>
-    result          = dwnCandle[1] and tallBody[1] and upCandle and open <= low[1] and close > middleBody[1] and close < open[1]
+    dwnCandlePrev and tallBodyPrev and upCandle and open <= low[1] and close > middleBody[1] and close < open[1]
 
 // @function            Produces "Piercing" identifier label
 // @param showLabel     (series bool) Shows label when input is true. Default is false
 // @param labelColor    (series color) Color of the label border and arrow
 // @param textColor     (series color) Text color
+// @param patternDetected (series bool) Draws the label only on bars where the pattern is detected. Default is true
 // @returns             (label) A label visible at the chart level intended for the title pattern   
-export pLab(bool showLabel = false, color labelColor = #64b5f6, color textColor = color.white) =>
-    if showLabel
-        var Piercing = "Piercing\nA two-candle bullish reversal candlestick pattern found in a downtrend. The first candle is red and has a larger than average body. The second candle is green and opens below the low of the prior candle, creating a gap, and then closes above the midpoint of the first candle."
-        label.new(bar_index, na, text="P", yloc = yloc.belowbar, color = labelColor, style = label.style_label_up, textcolor = textColor, tooltip = Piercing)
+export pLab(bool showLabel = false, color labelColor = #64b5f6, color textColor = color.white, bool patternDetected = true) =>
+    if showLabel and patternDetected
+        label.new(bar_index, na, text="P", yloc = yloc.belowbar, color = labelColor, style = label.style_label_up, textcolor = textColor, tooltip = PIERCING_TIP)
 
 // @function            Detects "Dark Cloud Cover" candle patterns
 // @returns             (series bool) True when pattern detected 
 export darkCloudCover() =>
-    result          = upCandle[1] and tallBody[1] and dwnCandle and open >= high[1] and close < middleBody[1] and close > open[1]
+    upCandlePrev and tallBodyPrev and dwnCandle and open >= high[1] and close < middleBody[1] and close > open[1]
 
 // @function            Produces "Dark Cloud Cover" identifier label
 // @param showLabel     (series bool) Shows label when input is true. Default is false
 // @param labelColor    (series color) Color of the label border and arrow
 // @param textColor     (series color) Text color
+// @param patternDetected (series bool) Draws the label only on bars where the pattern is detected. Default is true
 // @returns             (label) A label visible at the chart level intended for the title pattern   
-export dccLab(bool showLabel = false, color labelColor = #ef5350, color textColor = color.white) =>
-    if showLabel
-        var DarkCloudCover = "Dark Cloud Cover\nA two-candle bearish reversal candlestick pattern found in an uptrend. The first candle is green and has a larger than average body. The second candle is red and opens above the high of the prior candle, creating a gap, and then closes below the midpoint of the first candle."
-        label.new(bar_index, na, text="DCC", yloc = yloc.abovebar, color = labelColor, style = label.style_label_down, textcolor = textColor, tooltip = DarkCloudCover)
+export dccLab(bool showLabel = false, color labelColor = #ef5350, color textColor = color.white, bool patternDetected = true) =>
+    if showLabel and patternDetected
+        label.new(bar_index, na, text="DCC", yloc = yloc.abovebar, color = labelColor, style = label.style_label_down, textcolor = textColor, tooltip = DARK_CLOUD_COVER_TIP)
 
 // @function            Detects "Upside Tasuki Gap" candle patterns
 // @returns             (series bool) True when pattern detected 
 export tasukiBull() =>
-    result          =  tallBody[2] and shortBody[1] and upCandle[2] and bodyUpGap[1] and upCandle[1] and dwnCandle and bodyLow >= bodyHigh[2] and bodyLow <= bodyLow[1]
+    tallBody[2] and shortBody[1] and upCandle[2] and bodyUpGap[1] and upCandle[1] and dwnCandle and bodyLow >= bodyHigh[2] and bodyLow <= bodyLow[1]
 
 // @function            Produces "Upside Tasuki Gap" identifier label
 // @param showLabel     (series bool) Shows label when input is true. Default is false
 // @param labelColor    (series color) Color of the label border and arrow
 // @param textColor     (series color) Text color
+// @param patternDetected (series bool) Draws the label only on bars where the pattern is detected. Default is true
 // @returns             (label) A label visible at the chart level intended for the title pattern   
-export utgLab(bool showLabel = false, color labelColor = #64b5f6, color textColor = color.white) =>
-    if showLabel
-        var TasukiBull = "Upside Tasuki Gap\nA three-candle pattern found in an uptrend that usually hints at the continuation of the uptrend. The first candle is long and green, followed by a smaller green candle with its opening price that gaps above the body of the previous candle. The third candle is red and it closes inside the gap created by the first two candles, unable to close it fully."
-        label.new(bar_index, na, text="UTG", yloc = yloc.belowbar, color = labelColor, style = label.style_label_up, textcolor = textColor, tooltip = TasukiBull)
+export utgLab(bool showLabel = false, color labelColor = #64b5f6, color textColor = color.white, bool patternDetected = true) =>
+    if showLabel and patternDetected
+        label.new(bar_index, na, text="UTG", yloc = yloc.belowbar, color = labelColor, style = label.style_label_up, textcolor = textColor, tooltip = TASUKI_BULL_TIP)
 
 // @function            Detects "Downside Tasuki Gap" candle patterns
 // @returns             (series bool) True when pattern detected 
 export tasukiBear() =>
-    result          = tallBody[2] and shortBody[1] and dwnCandle[2] and bodyDwnGap[1] and dwnCandle[1] and upCandle and bodyHigh <= bodyLow[2] and bodyHigh >= bodyHigh[1]
+    tallBody[2] and shortBody[1] and dwnCandle[2] and bodyDwnGap[1] and dwnCandle[1] and upCandle and bodyHigh <= bodyLow[2] and bodyHigh >= bodyHigh[1]
 
 // @function            Produces "Downside Tasuki Gap" identifier label
 // @param showLabel     (series bool) Shows label when input is true. Default is false
 // @param labelColor    (series color) Color of the label border and arrow
 // @param textColor     (series color) Text color
+// @param patternDetected (series bool) Draws the label only on bars where the pattern is detected. Default is true
 // @returns             (label) A label visible at the chart level intended for the title pattern   
-export dtgLab(bool showLabel = false, color labelColor = #ef5350, color textColor = color.white) =>
-    if showLabel
-        var TasukiBear = "Downside Tasuki Gap\nA three-candle pattern found in a downtrend that usually hints at the continuation of the downtrend. The first candle is long and red, followed by a smaller red candle with its opening price that gaps below the body of the previous candle. The third candle is green and it closes inside the gap created by the first two candles, unable to close it fully."
-        label.new(bar_index, na, text="DTG", yloc = yloc.abovebar, color = labelColor, style = label.style_label_down, textcolor = textColor, tooltip = TasukiBear)
+export dtgLab(bool showLabel = false, color labelColor = #ef5350, color textColor = color.white, bool patternDetected = true) =>
+    if showLabel and patternDetected
+        label.new(bar_index, na, text="DTG", yloc = yloc.abovebar, color = labelColor, style = label.style_label_down, textcolor = textColor, tooltip = TASUKI_BEAR_TIP)
+
+// the three inner bars of the three methods patterns stay within the range of
+// the first bar: inBullRange[1] is open[1..3] < high[4] and close[1..3] > low[4]
+inBullRange         = math.max(open, open[1], open[2]) < high[3] and math.min(close, close[1], close[2]) > low[3]
+inBearRange         = math.min(open, open[1], open[2]) > low[3]  and math.max(close, close[1], close[2]) < high[3]
 
 // @function            Detects "Rising Three Methods" candle patterns
 // @returns             (series bool) True when pattern detected 
 export risingThree() =>
-    result          = tallBody[4]       and upCandle[4]      and shortBody[3]           and dwnCandle[3]     and open[3]<high[4] and close[3]>low[4] and 
-                      shortBody[2]      and dwnCandle[2]     and open[2]<high[4]        and close[2]>low[4]  and shortBody[1]    and dwnCandle[1]    and 
-                      open[1]<high[4]   and close[1]>low[4]  and tallBody and upCandle  and close>close[4]
+    tallBody          and upCandle         and tallBody[4]      and upCandle[4]      and close>close[4]   and 
+      shortBody[3]      and shortBody[2]     and shortBody[1]     and dwnCandle[3]     and dwnCandle[2]     and dwnCandle[1]     and 
+      inBullRange[1]
 
 // @function            Produces "Rising Three Methods" identifier label
 // @param showLabel     (series bool) Shows label when input is true. Default is false
 // @param labelColor    (series color) Color of the label border and arrow
 // @param textColor     (series color) Text color
+// @param patternDetected (series bool) Draws the label only on bars where the pattern is detected. Default is true
 // @returns             (label) A label visible at the chart level intended for the title pattern   
-export rtmLab(bool showLabel = false, color labelColor = #64b5f6, color textColor = color.white) =>
-    if showLabel
-        var RisingThree = "Rising Three Methods\nA five-candle bullish pattern that signifies a continuation of an existing uptrend. The first candle is long and green, followed by three short red candles with bodies inside the range of the first candle. The last candle is also green and long and it closes above the close of the first candle."
-        label.new(bar_index, na, text="RTM", yloc = yloc.belowbar, color = labelColor, style = label.style_label_up, textcolor = textColor, tooltip = RisingThree)
+export rtmLab(bool showLabel = false, color labelColor = #64b5f6, color textColor = color.white, bool patternDetected = true) =>
+    if showLabel and patternDetected
+        label.new(bar_index, na, text="RTM", yloc = yloc.belowbar, color = labelColor, style = label.style_label_up, textcolor = textColor, tooltip = RISING_THREE_TIP)
 
 // @function            Detects "Falling Three Methods" candle patterns
 // @returns             (series bool) True when pattern detected 
 export fallingThree() =>
-    result          = tallBody[4]       and dwnCandle[4]      and shortBody[3]           and upCandle[3]       and open[3]>low[4] and close[3]<high[4] and 
-                      shortBody[2]      and upCandle[2]       and open[2]>low[4]         and close[2]<high[4]  and shortBody[1]   and upCandle[1]      and 
-                      open[1]>low[4]    and close[1]<high[4]  and tallBody and dwnCandle and close<close[4]
+    tallBody          and dwnCandle        and tallBody[4]      and dwnCandle[4]     and close<close[4]   and 
+      shortBody[3]      and shortBody[2]     and shortBody[1]     and upCandle[3]      and upCandle[2]      and upCandle[1]      and 
+      inBearRange[1]
 
 // @function            Produces "Falling Three Methods" identifier label
 // @param showLabel     (series bool) Shows label when input is true. Default is false
 // @param labelColor    (series color) Color of the label border and arrow
 // @param textColor     (series color) Text color
+// @param patternDetected (series bool) Draws the label only on bars where the pattern is detected. Default is true
 // @returns             (label) A label visible at the chart level intended for the title pattern   
-export ftmLab(bool showLabel = false, color labelColor = #ef5350, color textColor = color.white) =>
-    if showLabel
-        var FallingThree = "FallingThree\nA five-candle bearish pattern that signifies a continuation of an existing downtrend. The first candle is long and red, followed by three short green candles with bodies inside the range of the first candle. The last candle is also red and long and it closes below the close of the first candle."
-        label.new(bar_index, na, text="FTM", yloc = yloc.abovebar, color = labelColor, style = label.style_label_down, textcolor = textColor, tooltip = FallingThree)
+export ftmLab(bool showLabel = false, color labelColor = #ef5350, color textColor = color.white, bool patternDetected = true) =>
+    if showLabel and patternDetected
+        label.new(bar_index, na, text="FTM", yloc = yloc.abovebar, color = labelColor, style = label.style_label_down, textcolor = textColor, tooltip = FALLING_THREE_TIP)
 
 // @function            Detects "Rising Window" candle patterns
 // @returns             (series bool) True when pattern detected 
 export risingWindow() =>
-    result          = candleSize !=0 and candleSize[1] != 0 and low > high[1]
+    nonZeroBar and nonZeroBar[1] and low > high[1]
 
 // @function            Produces "Rising Window" identifier label
 // @param showLabel     (series bool) Shows label when input is true. Default is false
 // @param labelColor    (series color) Color of the label border and arrow
 // @param textColor     (series color) Text color
+// @param patternDetected (series bool) Draws the label only on bars where the pattern is detected. Default is true
 // @returns             (label) A label visible at the chart level intended for the title pattern   
-export rwLab(bool showLabel = false, color labelColor = #64b5f6, color textColor = color.white) =>
-    if showLabel
-        var RisingWindow =  "Rising Window\nA two-candle bullish continuation pattern that forms during an uptrend. The most important characteristic of the pattern is a price gap between the first candle's high and the second candle's low."
-        label.new(bar_index, na, text="RW", yloc = yloc.belowbar, color = labelColor, style = label.style_label_up, textcolor = textColor, tooltip = RisingWindow)
+export rwLab(bool showLabel = false, color labelColor = #64b5f6, color textColor = color.white, bool patternDetected = true) =>
+    if showLabel and patternDetected
+        label.new(bar_index, na, text="RW", yloc = yloc.belowbar, color = labelColor, style = label.style_label_up, textcolor = textColor, tooltip = RISING_WINDOW_TIP)
 
 // @function            Detects "Falling Window" candle patterns
 // @returns             (series bool) True when pattern detected 
 export fallingWindow() =>
-    result          = candleSize != 0 and candleSize[1] != 0 and high < low[1]
+    nonZeroBar and nonZeroBar[1] and high < low[1]
 
 // @function            Produces "Falling Window" identifier label
 // @param showLabel     (series bool) Shows label when input is true. Default is false
 // @param labelColor    (series color) Color of the label border and arrow
 // @param textColor     (series color) Text color
+// @param patternDetected (series bool) Draws the label only on bars where the pattern is detected. Default is true
 // @returns             (label) A label visible at the chart level intended for the title pattern   
-export fwLab(bool showLabel = false, color labelColor = #ef5350, color textColor = color.white) =>
-    if showLabel
-        var FallingWindow ="Falling Window\nA two-candle bearish continuation pattern that forms during a downtrend. The most important characteristic of the pattern is a price gap between the first candle's low and the second candle's high."
-        label.new(bar_index, na, text="FW", yloc = yloc.abovebar, color = labelColor, style = label.style_label_down, textcolor = textColor, tooltip = FallingWindow)
+export fwLab(bool showLabel = false, color labelColor = #ef5350, color textColor = color.white, bool patternDetected = true) =>
+    if showLabel and patternDetected
+        label.new(bar_index, na, text="FW", yloc = yloc.abovebar, color = labelColor, style = label.style_label_down, textcolor = textColor, tooltip = FALLING_WINDOW_TIP)
 
 // @function            Detects "Bullish Kicking" candle patterns
 // @returns             (series bool) True when pattern detected 
 export kickingBull() =>
-    result          = marubearzu()[1] and marubullzu() and upGap
+    maruBear[1] and maruBull and upGap
 
 // @function            Produces "Bullish Kicking" identifier label
 // @param showLabel     (series bool) Shows label when input is true. Default is false
 // @param labelColor    (series color) Color of the label border and arrow
 // @param textColor     (series color) Text color
+// @param patternDetected (series bool) Draws the label only on bars where the pattern is detected. Default is true
 // @returns             (label) A label visible at the chart level intended for the title pattern   
-export kwLab(bool showLabel = false, color labelColor = #64b5f6, color textColor = color.white) =>
-    if showLabel
-        var KickingBull =  "Kicking\nThe first day candlestick is a bearish marubozu candlestick with next to no upper or lower shadow and where the price opens at the day’s high and closes at the day’s low. The second day is a bullish marubozu pattern, with next to no upper or lower shadow and where the price opens at the day’s low and closes at the day’s high"
-        label.new(bar_index, na, text="K", yloc = yloc.belowbar, color = labelColor, style = label.style_label_up, textcolor = textColor, tooltip = KickingBull)
+export kwLab(bool showLabel = false, color labelColor = #64b5f6, color textColor = color.white, bool patternDetected = true) =>
+    if showLabel and patternDetected
+        label.new(bar_index, na, text="K", yloc = yloc.belowbar, color = labelColor, style = label.style_label_up, textcolor = textColor, tooltip = KICKING_BULL_TIP)
 
 // @function            Detects "Bearish Kicking" candle patterns
 // @returns             (series bool) True when pattern detected 
 export kickingBear() =>
-    result          = marubullzu()[1] and marubearzu() and dwnGap
+    maruBull[1] and maruBear and dwnGap
 
 // @function            Produces "Bearish Kicking" identifier label
 // @param showLabel     (series bool) Shows label when input is true. Default is false
 // @param labelColor    (series color) Color of the label border and arrow
 // @param textColor     (series color) Text color
+// @param patternDetected (series bool) Draws the label only on bars where the pattern is detected. Default is true
 // @returns             (label) A label visible at the chart level intended for the title pattern   
-export kbLab(bool showLabel = false, color labelColor = #ef5350, color textColor = color.white) =>
-    if showLabel
-        var KickingBear = "Kicking\nThe first day candlestick is a bullish marubozu candlestick with next to no upper or lower shadow and where the price opens at the day’s low and closes at the day’s high. The second day is a bearish marubozu pattern, with next to no upper or lower shadow and where the price opens at the day’s high and closes at the day’s low"
-        label.new(bar_index, na, text="K", yloc = yloc.abovebar, color = labelColor, style = label.style_label_down, textcolor = textColor, tooltip = KickingBear)
+export kbLab(bool showLabel = false, color labelColor = #ef5350, color textColor = color.white, bool patternDetected = true) =>
+    if showLabel and patternDetected
+        label.new(bar_index, na, text="K", yloc = yloc.abovebar, color = labelColor, style = label.style_label_down, textcolor = textColor, tooltip = KICKING_BEAR_TIP)
 
 // @function            Detects "Long Lower Shadow" candle patterns
 // @param ratio         (float) A relationship of the lower wick to the overall candle size expressed as a percent. Default is 75% 
 // @returns             (series bool) True when pattern detected 
 export lls(float ratio = 75) =>
-    result          = bottomWickSize > candleSize/100*ratio
+    bottomWickSize > candleSizePct * ratio
 
 // @function            Produces "Long Lower Shadow" identifier label
 // @param showLabel     (series bool) Shows label when input is true. Default is false
 // @param labelColor    (series color) Color of the label border and arrow
 // @param textColor     (series color) Text color
+// @param patternDetected (series bool) Draws the label only on bars where the pattern is detected. Default is true
 // @returns             (label) A label visible at the chart level intended for the title pattern   
-export llsLab(bool showLabel = false, color labelColor = #64b5f6, color textColor = color.white) =>
-    if showLabel
-        var LLS = "Long Lower Shadow\nTo indicate seller domination of the first part of a session, candlesticks will present with long lower shadows, as well as short upper shadows, which leaves sellers underwater by candles end"
-        label.new(bar_index, na, text="LLS", yloc = yloc.belowbar, color = labelColor, style = label.style_label_up, textcolor = textColor, tooltip = LLS)
+export llsLab(bool showLabel = false, color labelColor = #64b5f6, color textColor = color.white, bool patternDetected = true) =>
+    if showLabel and patternDetected
+        label.new(bar_index, na, text="LLS", yloc = yloc.belowbar, color = labelColor, style = label.style_label_up, textcolor = textColor, tooltip = LLS_TIP)
 
 // @function            Detects "Long Upper Shadow" candle patterns
 // @param ratio         (float) A relationship of the upper wick to the overall candle size expressed as a percent. Default is 75% 
 // @returns             (series bool) True when pattern detected 
 export lus(float ratio = 75) =>
-    result          = topWickSize > candleSize/100*ratio
+    topWickSize > candleSizePct * ratio
 
 // @function            Produces "Long Upper Shadow" identifier label
 // @param showLabel     (series bool) Shows label when input is true. Default is false
 // @param labelColor    (series color) Color of the label border and arrow
 // @param textColor     (series color) Text color
+// @param patternDetected (series bool) Draws the label only on bars where the pattern is detected. Default is true
 // @returns             (label) A label visible at the chart level intended for the title pattern   
-export lusLab(bool showLabel = false, color labelColor = #ef5350, color textColor = color.white) =>
-    if showLabel
-        var LUS = "Long Upper Shadow\nTo indicate buyer domination of the first part of a session, candlesticks will present with long upper shadows, as well as short lower shadows, which leaves buyers underwater by candles end"
-        label.new(bar_index, na, text="LUS", yloc = yloc.abovebar, color = labelColor, style = label.style_label_down, textcolor = textColor, tooltip = LUS)
+export lusLab(bool showLabel = false, color labelColor = #ef5350, color textColor = color.white, bool patternDetected = true) =>
+    if showLabel and patternDetected
+        label.new(bar_index, na, text="LUS", yloc = yloc.abovebar, color = labelColor, style = label.style_label_down, textcolor = textColor, tooltip = LUS_TIP)
 
 // @function            Detects "Bullish On Neck" candle patterns
 // @returns             (series bool) True when pattern detected 
 export bullNeck() =>
-    result          = upCandle[1] and tallBody[1] and dwnCandle and open > close[1] and shortBody and candleSize !=0 and math.abs(close-high[1]) <= bodyAvg*0.05
+    neckGap         = close - high[1]
+    upCandlePrev and tallBodyPrev and dwnCandle and open > close[1] and shortBody and candleSize !=0 and neckGap <= neckTol and neckGap >= -neckTol
 
 // @function            Produces "Bullish On Neck" identifier label
 // @param showLabel     (series bool) Shows label when input is true. Default is false
 // @param labelColor    (series color) Color of the label border and arrow
 // @param textColor     (series color) Text color
+// @param patternDetected (series bool) Draws the label only on bars where the pattern is detected. Default is true
 // @returns             (label) A label visible at the chart level intended for the title pattern   
-export nwLab(bool showLabel = false, color labelColor = #64b5f6, color textColor = color.white) =>
-    if showLabel
-        var BullNeck = "On Neck - Bullsih\nOn Neck is a two-line continuation pattern found in a uptrend. The first candle is long and green, the second candle is short and has a red body. The closing price of the second candle is close or equal to the first candle's high price. Hints at continuation of trend"
-        label.new(bar_index, na, text="N", yloc = yloc.belowbar, color = labelColor, style = label.style_label_up, textcolor = textColor, tooltip = BullNeck)
+export nwLab(bool showLabel = false, color labelColor = #64b5f6, color textColor = color.white, bool patternDetected = true) =>
+    if showLabel and patternDetected
+        label.new(bar_index, na, text="N", yloc = yloc.belowbar, color = labelColor, style = label.style_label_up, textcolor = textColor, tooltip = BULL_NECK_TIP)
 
 // @function            Detects "Bearish On Neck" candle patterns
 // @returns             (series bool) True when pattern detected 
 export bearNeck() =>
-    result          = dwnCandle[1] and tallBody[1] and upCandle and open < close[1] and shortBody and candleSize !=0 and math.abs(close-low[1]) <= bodyAvg*0.05
+    neckGap         = close - low[1]
+    dwnCandlePrev and tallBodyPrev and upCandle and open < close[1] and shortBody and candleSize !=0 and neckGap <= neckTol and neckGap >= -neckTol
 
 // @function            Produces "Bearish On Neck" identifier label
 // @param showLabel     (series bool) Shows label when input is true. Default is false
 // @param labelColor    (series color) Color of the label border and arrow
 // @param textColor     (series color) Text color
+// @param patternDetected (series bool) Draws the label only on bars where the pattern is detected. Default is true
 // @returns             (label) A label visible at the chart level intended for the title pattern   
-export nbLab(bool showLabel = false, color labelColor = #ef5350, color textColor = color.white) =>
-    if showLabel
-        var BearNeck = "On Neck - Bearish\nOn Neck is a two-line continuation pattern found in a downtrend. The first candle is long and red, the second candle is short and has a green body. The closing price of the second candle is close or equal to the first candle's low price. Hints at continuation of trend"
-        label.new(bar_index, na, text="N", yloc = yloc.abovebar, color = labelColor, style = label.style_label_down, textcolor = textColor, tooltip = BearNeck)
+export nbLab(bool showLabel = false, color labelColor = #ef5350, color textColor = color.white, bool patternDetected = true) =>
+    if showLabel and patternDetected
+        label.new(bar_index, na, text="N", yloc = yloc.abovebar, color = labelColor, style = label.style_label_down, textcolor = textColor, tooltip = BEAR_NECK_TIP)
 
 // @function            Detects "Three White Soldiers" candle patterns
 // @param wickSize      (float) Maximum allowable top wick size throughout pattern expressed as a percent of total candle height. Default is 5% 
 // @returns             (series bool) True when pattern detected 
 export soldiers(float wickSize = 5) =>
-    wicks           = candleSize * wickSize / 100 > topWickSize
-    result          = tallBody and tallBody[1] and tallBody[2]   and upCandle and upCandle[1] and upCandle[2]    and 
-                      close   > close[1] and close[1] > close[2] and open < close[1]          and open > open[1] and 
-                      open[1] < close[2] and open[1]  > open[2]  and wicks and wicks[1]       and wicks[2]
+    wickThresh      = candleSizePct * wickSize
+    wicks           = wickThresh > topWickSize
+    tallBody and tallBody[1] and tallBody[2]   and upCandle and upCandle[1] and upCandle[2]    and 
+      wicks    and wicks[1]    and wicks[2]      and close > close[1]         and close[1] > close[2] and 
+      open < close[1]  and open > open[1]        and open[1] < close[2]       and open[1]  > open[2]
 
 // @function            Produces "Three White Soldiers" identifier label
 // @param showLabel     (series bool) Shows label when input is true. Default is false
 // @param labelColor    (series color) Color of the label border and arrow
 // @param textColor     (series color) Text color
+// @param patternDetected (series bool) Draws the label only on bars where the pattern is detected. Default is true
 // @returns             (label) A label visible at the chart level intended for the title pattern   
-export wsLab(bool showLabel = false, color labelColor = #64b5f6, color textColor = color.white) =>
-    if showLabel
-        var Soldiers = "Three White Soldiers\nThis bullish reversal pattern is made up of three long-bodied, green candles in immediate succession. Each one opens within the body before it and the close is near to the high."
-        label.new(bar_index, na, text="3WS", yloc = yloc.belowbar, color = labelColor, style = label.style_label_up, textcolor = textColor, tooltip = Soldiers)
+export wsLab(bool showLabel = false, color labelColor = #64b5f6, color textColor = color.white, bool patternDetected = true) =>
+    if showLabel and patternDetected
+        label.new(bar_index, na, text="3WS", yloc = yloc.belowbar, color = labelColor, style = label.style_label_up, textcolor = textColor, tooltip = SOLDIERS_TIP)
 
 // @function            Detects "Three Black Crows" candle patterns
 // @param               wickSize (float) Maximum allowable bottom wick size throughout pattern expressed as a percent of total candle height. Default is 5% 
 // @returns             (series bool) True when pattern detected 
 export crows(float wickSize = 5) =>
-    wicks           = candleSize * wickSize / 100 > bottomWickSize
-    result          = tallBody and tallBody[1] and tallBody[2]   and dwnCandle and dwnCandle[1] and dwnCandle[2]   and 
-                      close   < close[1] and close[1] < close[2] and open > close[1]            and open < open[1] and 
-                      open[1] > close[2] and open[1]  < open[2]  and wicks and wicks[1]         and wicks[2]
+    wickThresh      = candleSizePct * wickSize
+    wicks           = wickThresh > bottomWickSize
+    tallBody and tallBody[1] and tallBody[2]   and dwnCandle and dwnCandle[1] and dwnCandle[2]   and 
+      wicks    and wicks[1]    and wicks[2]      and close < close[1]           and close[1] < close[2] and 
+      open > close[1]  and open < open[1]        and open[1] > close[2]         and open[1]  < open[2]
 
 // @function            Produces "Three Black Crows" identifier label
 // @param showLabel     (series bool) Shows label when input is true. Default is false
 // @param labelColor    (series color) Color of the label border and arrow
 // @param textColor     (series color) Text color
+// @param patternDetected (series bool) Draws the label only on bars where the pattern is detected. Default is true
 // @returns             (label) A label visible at the chart level intended for the title pattern   
-export bcLab(bool showLabel = false, color labelColor = #ef5350, color textColor = color.white) =>
-    if showLabel
-        var Crows = "Three Black Crows\nThis is a bearish reversal pattern that consists of three long, red-bodied candles in immediate succession. For each of these candles, each day opens within the body of the day before and closes either at or near its low."
-        label.new(bar_index, na, text="3BC", yloc = yloc.abovebar, color = labelColor, style = label.style_label_down, textcolor = textColor, tooltip = Crows)
+export bcLab(bool showLabel = false, color labelColor = #ef5350, color textColor = color.white, bool patternDetected = true) =>
+    if showLabel and patternDetected
+        label.new(bar_index, na, text="3BC", yloc = yloc.abovebar, color = labelColor, style = label.style_label_down, textcolor = textColor, tooltip = CROWS_TIP)
 
 // @function            Detects "Bullish Tri-Star" candle patterns
 // @returns             (series bool) True when pattern detected 
 export triStarBull() =>
-    result          = doji() and doji()[2] and doji()[3] and bodyDwnGap[1] and bodyUpGap
+    isDoji and isDoji[2] and isDoji[3] and bodyDwnGap[1] and bodyUpGap
 
 // @function            Produces "Bullish Tri-Star" identifier label
 // @param showLabel     (series bool) Shows label when input is true. Default is false
 // @param labelColor    (series color) Color of the label border and arrow
 // @param textColor     (series color) Text color
+// @param patternDetected (series bool) Draws the label only on bars where the pattern is detected. Default is true
 // @returns             (label) A label visible at the chart level intended for the title pattern   
-export tswLab(bool showLabel = false, color labelColor = #64b5f6, color textColor = color.white) =>
-    if showLabel
-        var TriStarBull = "Tri-Star Bull\nA bullish TriStar pattern can form when three doji candlesticks materialize in immediate succession at the tail-end of an extended downtrend. The first doji candle marks indecision between bull and bear. The second doji gaps in the direction of the leading trend. The third changes the attitude of the market once the candlestick opens in the direction opposite to the trend."      
-        label.new(bar_index, na, text="3S", yloc = yloc.belowbar, color = labelColor, style = label.style_label_up, textcolor = textColor, tooltip = TriStarBull)
+export tswLab(bool showLabel = false, color labelColor = #64b5f6, color textColor = color.white, bool patternDetected = true) =>
+    if showLabel and patternDetected
+        label.new(bar_index, na, text="3S", yloc = yloc.belowbar, color = labelColor, style = label.style_label_up, textcolor = textColor, tooltip = TRI_STAR_BULL_TIP)
 
 // @function            Detects "Bearish Tri-Star" candle patterns
 // @returns             (series bool) True when pattern detected 
 export triStarBear() =>
-    result          = doji() and doji()[2] and doji()[3] and bodyDwnGap and bodyUpGap[1]
+    isDoji and isDoji[2] and isDoji[3] and bodyDwnGap and bodyUpGap[1]
 
 // @function            Produces "Bearish Tri-Star" identifier label
 // @param showLabel     (series bool) Shows label when input is true. Default is false
 // @param labelColor    (series color) Color of the label border and arrow
 // @param textColor     (series color) Text color
+// @param patternDetected (series bool) Draws the label only on bars where the pattern is detected. Default is true
 // @returns             (label) A label visible at the chart level intended for the title pattern   
-export tsbLab(bool showLabel = false, color labelColor = #ef5350, color textColor = color.white) =>
-    if showLabel
-        var TriStarBear = "Tri-Star Bear\nA bearish TriStar pattern can form when three doji candlesticks materialize in immediate succession at the tail-end of an extended uptrend. The first doji candle marks indecision between bull and bear. The second doji gaps in the direction of the leading trend. The third changes the attitude of the market once the candlestick opens in the direction opposite to the trend."
-        label.new(bar_index, na, text="3S", yloc = yloc.abovebar, color = labelColor, style = label.style_label_down, textcolor = textColor, tooltip = TriStarBear)
+export tsbLab(bool showLabel = false, color labelColor = #ef5350, color textColor = color.white, bool patternDetected = true) =>
+    if showLabel and patternDetected
+        label.new(bar_index, na, text="3S", yloc = yloc.abovebar, color = labelColor, style = label.style_label_down, textcolor = textColor, tooltip = TRI_STAR_BEAR_TIP)
 
 // @function            Detects "Inside Bar" candle patterns
 // @returns             (series bool) True when pattern detected 
 export insideBar() =>
-    result          = high < high[1] and low > low[1]
+    isInside
 
 // @function            Produces "Inside Bar" identifier label
 // @param showLabel     (series bool) Shows label when input is true. Default is false
 // @param labelColor    (series color) Color of the label border and arrow
 // @param textColor     (series color) Text color
+// @param patternDetected (series bool) Draws the label only on bars where the pattern is detected. Default is true
 // @returns             (label) A label visible at the chart level intended for the title pattern   
-export insLab(bool showLabel = false, color labelColor = color.gray, color textColor = color.white) =>
-    if showLabel
-        var insideBar = 'Inside Bar\nAn “inside bar” pattern is a two-bar price action trading strategy in which the inside bar is smaller and within the high to low range of the prior bar, i.e. the high is lower than the previous bar’s high, and the low is higher than the previous bar’s low.'        
-        label.new(bar_index, na, text="IB", yloc = yloc.belowbar, color = labelColor, style = label.style_label_up, textcolor = textColor, tooltip = insideBar)
+export insLab(bool showLabel = false, color labelColor = color.gray, color textColor = color.white, bool patternDetected = true) =>
+    if showLabel and patternDetected
+        label.new(bar_index, na, text="IB", yloc = yloc.belowbar, color = labelColor, style = label.style_label_up, textcolor = textColor, tooltip = INSIDE_BAR_TIP)
 
 // @function            Detects "Double Inside Bar" candle patterns
 // @returns             (series bool) True when pattern detected 
 export doubleInside() =>
-    result          = insideBar() and insideBar()[1]
+    isInside and isInside[1]
 
 // @function            Produces "Double Inside Bar" identifier label
 // @param showLabel     (series bool) Shows label when input is true. Default is false
 // @param labelColor    (series color) Color of the label border and arrow
 // @param textColor     (series color) Text color
+// @param patternDetected (series bool) Draws the label only on bars where the pattern is detected. Default is true
 // @returns             (label) A label visible at the chart level intended for the title pattern   
-export dinLab(bool showLabel = false, color labelColor = color.gray, color textColor = color.white) =>
-    if showLabel
-        var dInBar = "Double Inside Bar\nA 'Double Inside' pattern is a 3 bar pattern where 2 inside bars occur in a row. Often seen in consolidation or 'flag' patterns. The pattern typically favors continuation."       
-        label.new(bar_index, na, text="DI", yloc = yloc.belowbar, color = labelColor, style = label.style_label_up, textcolor = textColor, tooltip = dInBar)
+export dinLab(bool showLabel = false, color labelColor = color.gray, color textColor = color.white, bool patternDetected = true) =>
+    if showLabel and patternDetected
+        label.new(bar_index, na, text="DI", yloc = yloc.belowbar, color = labelColor, style = label.style_label_up, textcolor = textColor, tooltip = DOUBLE_INSIDE_TIP)
+
+// @function            Evaluates the multi-bar detectors listed below in one call. Prefer it to the separate detectors when using more than three of them
+// @returns             ([series bool]) abandonedBull, piercing, darkCloudCover, tasukiBull, tasukiBear, risingThree, fallingThree, risingWindow, fallingWindow, kickingBull, kickingBear, insideBar, doubleInside, triStarBull and triStarBear, in that order
+export allPatterns() =>
+    [abandonedBull(), piercing(),     darkCloudCover(), tasukiBull(),  tasukiBear(),   risingThree(), fallingThree(), risingWindow(), 
+     fallingWindow(), kickingBull(),  kickingBear(),    insideBar(),   doubleInside(), triStarBull(), triStarBear()]
+
+// @function            Packs every pattern detection, each detector at its default parameters, into one value. The bit positions are the ID_* constants:
+//                      bit  0 doji              bit 14 haramiBull        bit 28 risingWindow
+//                      bit  1 bullEngulf        bit 15 haramiBear        bit 29 fallingWindow
+//                      bit  2 bearEngulf        bit 16 haramiBullCross   bit 30 kickingBull
+//                      bit  3 hammer            bit 17 haramiBearCross   bit 31 kickingBear
+//                      bit  4 star              bit 18 marubullzu        bit 32 lls
+//                      bit  5 dragonflyDoji     bit 19 marubearzu        bit 33 lus
+//                      bit  6 gravestoneDoji    bit 20 abandonedBull     bit 34 bullNeck
+//                      bit  7 tweezerBottom     bit 21 abandonedBear     bit 35 bearNeck
+//                      bit  8 tweezerTop        bit 22 piercing          bit 36 soldiers
+//                      bit  9 spinningTopBull   bit 23 darkCloudCover    bit 37 crows
+//                      bit 10 spinningTopBear   bit 24 tasukiBull        bit 38 triStarBull
+//                      bit 11 spinningTop       bit 25 tasukiBear        bit 39 triStarBear
+//                      bit 12 morningStar       bit 26 risingThree       bit 40 insideBar
+//                      bit 13 eveningStar       bit 27 fallingThree      bit 41 doubleInside
+// @returns             (series float) The sum of 2^bit over the patterns detected on the bar. A float holds all 42 bits exactly
+export patternsMask() =>
+    (doji()              ? math.pow(2, ID_DOJI              ) : 0) +
+     (bullEngulf()       ? math.pow(2, ID_BULL_ENGULF      ) : 0) +
+     (bearEngulf()       ? math.pow(2, ID_BEAR_ENGULF      ) : 0) +
+     (hammer()           ? math.pow(2, ID_HAMMER           ) : 0) +
+     (star()             ? math.pow(2, ID_STAR             ) : 0) +
+     (dragonflyDoji()    ? math.pow(2, ID_DRAGONFLY_DOJI   ) : 0) +
+     (gravestoneDoji()   ? math.pow(2, ID_GRAVESTONE_DOJI  ) : 0) +
+     (tweezerBottom()    ? math.pow(2, ID_TWEEZER_BOTTOM   ) : 0) +
+     (tweezerTop()       ? math.pow(2, ID_TWEEZER_TOP      ) : 0) +
+     (spinningTopBull()  ? math.pow(2, ID_SPINNING_TOP_BULL) : 0) +
+     (spinningTopBear()  ? math.pow(2, ID_SPINNING_TOP_BEAR) : 0) +
+     (spinningTop()      ? math.pow(2, ID_SPINNING_TOP     ) : 0) +
+     (morningStar()      ? math.pow(2, ID_MORNING_STAR     ) : 0) +
+     (eveningStar()      ? math.pow(2, ID_EVENING_STAR     ) : 0) +
+     (haramiBull()       ? math.pow(2, ID_HARAMI_BULL      ) : 0) +
+     (haramiBear()       ? math.pow(2, ID_HARAMI_BEAR      ) : 0) +
+     (haramiBullCross()  ? math.pow(2, ID_HARAMI_BULL_CROSS) : 0) +
+     (haramiBearCross()  ? math.pow(2, ID_HARAMI_BEAR_CROSS) : 0) +
+     (marubullzu()       ? math.pow(2, ID_MARUBULLZU       ) : 0) +
+     (marubearzu()       ? math.pow(2, ID_MARUBEARZU       ) : 0) +
+     (abandonedBull()    ? math.pow(2, ID_ABANDONED_BULL   ) : 0) +
+     (abandonedBear()    ? math.pow(2, ID_ABANDONED_BEAR   ) : 0) +
+     (piercing()         ? math.pow(2, ID_PIERCING         ) : 0) +
+     (darkCloudCover()   ? math.pow(2, ID_DARK_CLOUD_COVER ) : 0) +
+     (tasukiBull()       ? math.pow(2, ID_TASUKI_BULL      ) : 0) +
+     (tasukiBear()       ? math.pow(2, ID_TASUKI_BEAR      ) : 0) +
+     (risingThree()      ? math.pow(2, ID_RISING_THREE     ) : 0) +
+     (fallingThree()     ? math.pow(2, ID_FALLING_THREE    ) : 0) +
+     (risingWindow()     ? math.pow(2, ID_RISING_WINDOW    ) : 0) +
+     (fallingWindow()    ? math.pow(2, ID_FALLING_WINDOW   ) : 0) +
+     (kickingBull()      ? math.pow(2, ID_KICKING_BULL     ) : 0) +
+     (kickingBear()      ? math.pow(2, ID_KICKING_BEAR     ) : 0) +
+     (lls()              ? math.pow(2, ID_LLS              ) : 0) +
+     (lus()              ? math.pow(2, ID_LUS              ) : 0) +
+     (bullNeck()         ? math.pow(2, ID_BULL_NECK        ) : 0) +
+     (bearNeck()         ? math.pow(2, ID_BEAR_NECK        ) : 0) +
+     (soldiers()         ? math.pow(2, ID_SOLDIERS         ) : 0) +
+     (crows()            ? math.pow(2, ID_CROWS            ) : 0) +
+     (triStarBull()      ? math.pow(2, ID_TRI_STAR_BULL    ) : 0) +
+     (triStarBear()      ? math.pow(2, ID_TRI_STAR_BEAR    ) : 0) +
+     (insideBar()        ? math.pow(2, ID_INSIDE_BAR       ) : 0) +
+     (doubleInside()     ? math.pow(2, ID_DOUBLE_INSIDE    ) : 0)
+
+// @function            Tests one bit of a patternsMask() value
+// @param mask          (series float) Value returned by patternsMask()
+// @param bit           (int) Bit position of the pattern, 0 to 41 as listed at patternsMask()
+// @returns             (series bool) True when the pattern of that bit is detected
+export hasPattern(float mask, int bit) =>
+    math.floor(mask / math.pow(2, bit)) % 2 == 1
+
+// one ATR and one price margin series for every wrap() call site
+atr30               = ta.atr(30)
+perc2               = close * 0.02
+
+// the box of wrap() and of the example's drawPat(): top and bottom padded by the smaller of 20% of ATR(30) and 2% of close
+_box(float top, float bottom, int barsBack, color borderColor, color bgColor) =>
+    min     = math.min(atr30 * 0.2, perc2)
+    box.new(bar_index - barsBack, top + min, bar_index + 1, bottom - min, border_color = borderColor, xloc = xloc.bar_index, bgcolor = bgColor)
 
 // @function            Produces a box wrapping the highs and lows over the look back.
 // @param cond          (series bool) Condition under which to draw the box.
@@ -714,15 +912,10 @@ export dinLab(bool showLabel = false, color labelColor = color.gray, color textC
 // @param bgcolor       (series color) Background color of the box. Optional. The default is `color.gray` with a 75% transparency.
 // @returns             (box) A box whom's top and bottom are above and below the highest and lowest points over the lookback  
 export wrap(bool cond = true, int barsBack = 1, color borderColor = #787B8665, color bgColor = #787B8625) =>
-    calc    = ta.atr( 30) * 0.2
-    perc    = close* 0.02  
-    min     = math.min(calc, perc)
-    top     = ta.highest(high, barsBack) + min
-    bottom  = ta.lowest (low , barsBack) - min
-    left    = bar_index - barsBack
-    right   = bar_index + 1
+    top     = ta.highest(high, barsBack)
+    bottom  = ta.lowest (low , barsBack)
     if cond
-        box.new(left, top, right, bottom, border_color = borderColor, xloc = xloc.bar_index, bgcolor = bgColor)
+        _box(top, bottom, barsBack, borderColor, bgColor)
 
 // @function            Returns the top wick size of the current candle
 // @returns             (series float) A value equivelent to the distance from the top of the candle body to its high
@@ -795,6 +988,12 @@ export dojiBody() =>
 
 trendRule           =   input.string    ("Trend Rule 1", "Detect Trend Based On", options=["Trend Rule 1", "Trend Rule 2", "No detection"])
 
+// 0 = no detection, 1 = trend rule 1, 2 = trend rule 2; resolved once on the first bar
+var int trendMode   =   switch trendRule
+    "Trend Rule 1"  =>  1
+    "Trend Rule 2"  =>  2
+    =>                  0
+
 labels              =   input.bool      (true   ,   "show label"                    ,   group= "Bools")
 boxes               =   input.bool      (false  ,   "show box"                      ,   group= "Bools")
 ecWick              =   input.bool      (false  ,   "Engulfing Must Engulf Wick"    ,   group= "Bools"                )
@@ -817,148 +1016,307 @@ bgTransp            =   input.int       (100        , ""
 
 alertMode           =   input.string    (alert.freq_once_per_bar_close              ,   "Alerts Mode"                 , group  = "Alert Frequency"  ,   options= [alert.freq_once_per_bar, alert.freq_once_per_bar_close]) 
 
-_alert(_x, _y)      =>
-    if _x
-        alert   (_y + timeframe.period + ' chart. Price is ' + str.tostring(close), alertMode)
-
-bullBor             =   color.new       (bullColi, borderTransp)
-bullBg              =   color.new       (bullColi, bgTransp)
-neutBor             =   color.new       (neutColi, borderTransp)
-neutBg              =   color.new       (neutColi, bgTransp)
-bearBor             =   color.new       (bearColi, borderTransp)
-bearBg              =   color.new       (bearColi, bgTransp)
-
-priceAvg            =   ta.sma          (close  ,   50)
-sma200              =   ta.sma          (close  ,   200)
-sma50               =   ta.sma          (close  ,   50)
-
-utr1                =   close > priceAvg  
+bullPats            =   input.string    (""     ,   "Bull Reversals"            ,   group= "Patterns"             ,         tooltip= "Comma separated: bullEngulf, hammer, tweezerBottom, morningStar, haramiBull, haramiBullCross, marubullzu, abandonedBull, piercing, kickingBull, lls, soldiers, triStarBull")
+bearPats            =   input.string    (""     ,   "Bear Reversals"            ,   group= "Patterns"             ,         tooltip= "Comma separated: bearEngulf, star, tweezerTop, eveningStar, haramiBear, haramiBearCross, marubearzu, abandonedBear, darkCloudCover, kickingBear, lus, crows, triStarBear")
+contPats            =   input.string    (""     ,   "Continuations"             ,   group= "Patterns"             ,         tooltip= "Comma separated: tasukiBull, tasukiBear, risingThree, fallingThree, risingWindow, fallingWindow, bullNeck, bearNeck")
+neutPats            =   input.string    (""     ,   "Dojis & Neutral"           ,   group= "Patterns"             ,         tooltip= "Comma separated: doji, dragonflyDoji, gravestoneDoji, spinningTopBull, spinningTopBear, insideBar, doubleInside")
+
+var string tfSuffix =   timeframe.period + ' chart. Price is '
+
+var color bullBor   =   color.new       (bullColi, borderTransp)
+var color bullBg    =   color.new       (bullColi, bgTransp)
+var color neutBor   =   color.new       (neutColi, borderTransp)
+var color neutBg    =   color.new       (neutColi, bgTransp)
+var color bearBor   =   color.new       (bearColi, borderTransp)
+var color bearBg    =   color.new       (bearColi, bgTransp)
+
+// with both labels and boxes off the draw pass never runs
+var bool drawEnabled =  labels or boxes
+
+// the pattern lists are split once on the first bar; each enable flag is then a constant
+var string[] enabledPats = str.split(str.replace_all(bullPats + "," + bearPats + "," + contPats + "," + neutPats, " ", ""), ",")
+
+var string[] knownPats  = array.from("doji", "bullEngulf", "bearEngulf", "hammer", "star", "dragonflyDoji", "gravestoneDoji",
+                         "tweezerBottom", "tweezerTop", "spinningTopBull", "spinningTopBear", "morningStar", "eveningStar", "haramiBull",
+                         "haramiBear", "haramiBullCross", "haramiBearCross", "marubullzu", "marubearzu", "abandonedBull", "abandonedBear",
+                         "piercing", "darkCloudCover", "tasukiBull", "tasukiBear", "risingThree", "fallingThree", "risingWindow",
+                         "fallingWindow", "kickingBull", "kickingBear", "lls", "lus", "bullNeck", "bearNeck",
+                         "soldiers", "crows", "triStarBull", "triStarBear", "insideBar", "doubleInside")
+
+// a misspelled name would otherwise just leave its pattern off
+if barstate.isfirst
+    for name in enabledPats
+        if name != "" and not array.includes(knownPats, name)
+            runtime.error("Unknown pattern name \"" + name + "\" in the pattern lists")
+
+var bool enableD    =   array.includes  (enabledPats, "doji")
+var bool enableBew  =   array.includes  (enabledPats, "bullEngulf")
+var bool enableBeb  =   array.includes  (enabledPats, "bearEngulf")
+var bool enableH    =   array.includes  (enabledPats, "hammer")
+var bool enableSs   =   array.includes  (enabledPats, "star")
+var bool enableDd   =   array.includes  (enabledPats, "dragonflyDoji")
+var bool enableGd   =   array.includes  (enabledPats, "gravestoneDoji")
+var bool enableTb   =   array.includes  (enabledPats, "tweezerBottom")
+var bool enableTt   =   array.includes  (enabledPats, "tweezerTop")
+var bool enableStw  =   array.includes  (enabledPats, "spinningTopBull")
+var bool enableStb  =   array.includes  (enabledPats, "spinningTopBear")
+var bool enableMs   =   array.includes  (enabledPats, "morningStar")
+var bool enableEs   =   array.includes  (enabledPats, "eveningStar")
+var bool enableBhw  =   array.includes  (enabledPats, "haramiBull")
+var bool enableBhb  =   array.includes  (enabledPats, "haramiBear")
+var bool enableHcw  =   array.includes  (enabledPats, "haramiBullCross")
+var bool enableHcb  =   array.includes  (enabledPats, "haramiBearCross")
+var bool enableMw   =   array.includes  (enabledPats, "marubullzu")
+var bool enableMb   =   array.includes  (enabledPats, "marubearzu")
+var bool enableAbw  =   array.includes  (enabledPats, "abandonedBull")
+var bool enableAbb  =   array.includes  (enabledPats, "abandonedBear")
+var bool enableP    =   array.includes  (enabledPats, "piercing")
+var bool enableDcc  =   array.includes  (enabledPats, "darkCloudCover")
+var bool enableUtg  =   array.includes  (enabledPats, "tasukiBull")
+var bool enableDtg  =   array.includes  (enabledPats, "tasukiBear")
+var bool enableRtm  =   array.includes  (enabledPats, "risingThree")
+var bool enableFtm  =   array.includes  (enabledPats, "fallingThree")
+var bool enableRw   =   array.includes  (enabledPats, "risingWindow")
+var bool enableFw   =   array.includes  (enabledPats, "fallingWindow")
+var bool enableKw   =   array.includes  (enabledPats, "kickingBull")
+var bool enableKb   =   array.includes  (enabledPats, "kickingBear")
+var bool enableLl   =   array.includes  (enabledPats, "lls")
+var bool enableLu   =   array.includes  (enabledPats, "lus")
+var bool enableNw   =   array.includes  (enabledPats, "bullNeck")
+var bool enableNb   =   array.includes  (enabledPats, "bearNeck")
+var bool enableWs   =   array.includes  (enabledPats, "soldiers")
+var bool enableBc   =   array.includes  (enabledPats, "crows")
+var bool enableTsw  =   array.includes  (enabledPats, "triStarBull")
+var bool enableTsb  =   array.includes  (enabledPats, "triStarBear")
+var bool enableIb   =   array.includes  (enabledPats, "insideBar")
+var bool enableDib  =   array.includes  (enabledPats, "doubleInside")
+
+float sma50         =   ta.sma(close, 50)
+float sma200        =   ta.sma(close, 200)
+
+utr1                =   close > sma50
 utr2                =   close > sma50 and sma50 > sma200
 
-dtr1                =   close < priceAvg
+dtr1                =   close < sma50
 dtr2                =   close < sma50 and sma50 < sma200
 
-upTrend             =   trendRule == "Trend Rule 1" ? utr1 : trendRule == "Trend Rule 2" ? utr2 : true 
-downTrend           =   trendRule == "Trend Rule 1" ? dtr1 : trendRule == "Trend Rule 2" ? dtr2 : true
+// trendMode 0 ("No detection") passes every trend gate
+upTrend             =   switch trendMode
+    1               =>  utr1
+    2               =>  utr2
+    =>                  true
+downTrend           =   switch trendMode
+    1               =>  dtr1
+    2               =>  dtr2
+    =>                  true
+
+upTrendOrAny        =   upTrend
+downTrendOrAny      =   downTrend
+upTrendOrAny1       =   upTrend[1]
+downTrendOrAny1     =   downTrend[1]
+upTrendOrAny2       =   upTrend[2]
+downTrendOrAny2     =   downTrend[2]
+upTrendOrAny4       =   upTrend[4]
+downTrendOrAny4     =   downTrend[4]
 	
-d       =   input(false, "doji"             ) and doji              (dojiSize               =   dojiSize                        ,   dojiWickSize                  = dojiWickSize)
-bew     =   input(false, "bull Engulf"      ) and bullEngulf        (maxRejectWick          =   rejectWickMax                   ,   mustEngulfWick                = ecWick)             and upTrend
-beb     =   input(false, "bear Engulf"      ) and bearEngulf        (maxRejectWick          =   rejectWickMax                   ,   mustEngulfWick                = ecWick)             and downTrend
-h       =   input(false, "hammer"           ) and hammer            (ratio                  =   hammerFib                       ,   shadowPercent                 = hsShadowPerc)       and downTrend
-ss      =   input(false, "star"             ) and star              (ratio                  =   hammerFib                       ,   shadowPercent                 = hsShadowPerc)       and upTrend
-dd      =   input(false, "dragonfly Doji"   ) and dragonflyDoji     ()
-gd      =   input(false, "gravestone Doji"  ) and gravestoneDoji    ()
-tb      =   input(false, "tweezer Bottom"   ) and tweezerBottom     (closeUpperHalf         =   closeHalf)                      and downTrend[1]
-tt      =   input(false, "tweezer Top"      ) and tweezerTop        (closeLowerHalf         =   closeHalf)                      and upTrend  [1]
-stw     =   input(false, "spinning Top Bull") and spinningTopBull   (wickSize               =   spinWick)
-stb     =   input(false, "spinning Top Bear") and spinningTopBear   (wickSize               =   spinWick)
-ms      =   input(false, "morning Star"     ) and morningStar       ()                      and downTrend
-es      =   input(false, "evening Star"     ) and eveningStar       ()                      and upTrend
-bhw     =   input(false, "harami Bull"      ) and haramiBull        ()                      and downTrend[1]
-bhb     =   input(false, "harami Bear"      ) and haramiBear        ()                      and upTrend  [1]
-hcw     =   input(false, "harami Bull Cross") and haramiBullCross   ()                      and downTrend[1]
-hcb     =   input(false, "harami Bear Cross") and haramiBearCross   ()                      and upTrend  [1]
-mw      =   input(false, "marubullzu"       ) and marubullzu        ()
-mb      =   input(false, "marubearzu"       ) and marubearzu        ()
-abw     =   input(false, "abandoned Bull"   ) and abandonedBull     ()                      and downTrend[1]
-abb     =   input(false, "abandoned Bear"   ) and abandonedBear     ()                      and upTrend  [1]
-p       =   input(false, "piercing"         ) and piercing          ()                      and downTrend[1]
-dcc     =   input(false, "dark Cloud Cover" ) and darkCloudCover    ()                      and upTrend  [1]
-utg     =   input(false, "tasuki Bull"      ) and tasukiBull        ()                      and upTrend
-dtg     =   input(false, "tasuki Bear"      ) and tasukiBear        ()                      and downTrend
-rtm     =   input(false, "rising Three"     ) and risingThree       ()                      and upTrend  [4]          
-ftm     =   input(false, "falling Three"    ) and fallingThree      ()                      and downTrend[4]          
-rw      =   input(false, "rising Window"    ) and risingWindow      ()                      and upTrend  [1]
-fw      =   input(false, "falling Window"   ) and fallingWindow     ()                      and downTrend[1]
-kw      =   input(false, "kicking Bull"     ) and kickingBull       ()
-kb      =   input(false, "kicking Bear"     ) and kickingBear       ()
-ll      =   input(false, "lls"              ) and lls               (ratio                  =   lsRatio)
-lu      =   input(false, "lus"              ) and lus               (ratio                  =   lsRatio)
-nw      =   input(false, "bull Neck"        ) and bullNeck          ()                      and upTrend
-nb      =   input(false, "bear Neck"        ) and bearNeck          ()                      and downTrend
-ws      =   input(false, "soldiers"         ) and soldiers          (wickSize               =   scWick)
-bc      =   input(false, "crows"            ) and crows             (wickSize               =   scWick)
-tsw     =   input(false, "triStar Bull"     ) and triStarBull       ()                      and downTrend[2]
-tsb     =   input(false, "triStar Bear"     ) and triStarBear       ()                      and upTrend  [2]
-ib      =   input(false, "inside bar"       ) and insideBar         ()                    
-dib     =   input(false, "double inside bar") and doubleInside      ()                    
-
-dLab        (d   and labels, labelColor = na, textColor = neutColi)     ,   wrap(d   and boxes, borderColor = neutBor, bgColor = neutBg)
-bewLab      (bew and labels, labelColor = na, textColor = bullColi)     ,   wrap(bew and boxes, borderColor = bullBor, bgColor = bullBg, barsBack =2)
-bebLab      (beb and labels, labelColor = na, textColor = bearColi)     ,   wrap(beb and boxes, borderColor = bearBor, bgColor = bearBg, barsBack =2)
-hLab        (h   and labels, labelColor = na, textColor = bullColi)     ,   wrap(h   and boxes, borderColor = bullBor, bgColor = bullBg)
-ssLab       (ss  and labels, labelColor = na, textColor = bearColi)     ,   wrap(ss  and boxes, borderColor = bearBor, bgColor = bearBg)
-ddLab       (dd  and labels, labelColor = na, textColor = bullColi)     ,   wrap(dd  and boxes, borderColor = bullBor, bgColor = bullBg, barsBack =2)
-gdLab       (gd  and labels, labelColor = na, textColor = bearColi)     ,   wrap(gd  and boxes, borderColor = bearBor, bgColor = bearBg, barsBack =2)
-tbLab       (tb  and labels, labelColor = na, textColor = bullColi)     ,   wrap(tb  and boxes, borderColor = bullBor, bgColor = bullBg, barsBack =2)
-ttLab       (tt  and labels, labelColor = na, textColor = bearColi)     ,   wrap(tt  and boxes, borderColor = bearBor, bgColor = bearBg, barsBack =2)
-stwLab      (stw and labels, labelColor = na, textColor = neutColi)     ,   wrap(stw and boxes, borderColor = neutBor, bgColor = neutBg)
-stbLab      (stb and labels, labelColor = na, textColor = neutColi)     ,   wrap(stb and boxes, borderColor = neutBor, bgColor = neutBg)
-msLab       (ms  and labels, labelColor = na, textColor = bullColi)     ,   wrap(ms  and boxes, borderColor = bullBor, bgColor = bullBg, barsBack =3)
-esLab       (es  and labels, labelColor = na, textColor = bearColi)     ,   wrap(es  and boxes, borderColor = bearBor, bgColor = bearBg, barsBack =3)
-hwLab       (bhw and labels, labelColor = na, textColor = bullColi)     ,   wrap(bhw and boxes, borderColor = bullBor, bgColor = bullBg, barsBack =2)
-hbLab       (bhb and labels, labelColor = na, textColor = bearColi)     ,   wrap(bhb and boxes, borderColor = bearBor, bgColor = bearBg, barsBack =2)
-hcwLab      (hcw and labels, labelColor = na, textColor = bullColi)     ,   wrap(hcw and boxes, borderColor = bullBor, bgColor = bullBg, barsBack =2)
-hcbLab      (hcb and labels, labelColor = na, textColor = bearColi)     ,   wrap(hcb and boxes, borderColor = bearBor, bgColor = bearBg, barsBack =2)
-mwLab       (mw  and labels, labelColor = na, textColor = bullColi)     ,   wrap(mw  and boxes, borderColor = bullBor, bgColor = bullBg)
-mbLab       (mb  and labels, labelColor = na, textColor = bearColi)     ,   wrap(mb  and boxes, borderColor = bearBor, bgColor = bearBg)
-abwLab      (abw and labels, labelColor = na, textColor = bullColi)     ,   wrap(abw and boxes, borderColor = bullBor, bgColor = bullBg, barsBack =3)
-abbLab      (abb and labels, labelColor = na, textColor = bearColi)     ,   wrap(abb and boxes, borderColor = bearBor, bgColor = bearBg, barsBack =3)
-pLab        (p   and labels, labelColor = na, textColor = bullColi)     ,   wrap(p   and boxes, borderColor = bullBor, bgColor = bullBg, barsBack =2)
-dccLab      (dcc and labels, labelColor = na, textColor = bearColi)     ,   wrap(dcc and boxes, borderColor = bearBor, bgColor = bearBg, barsBack =2)
-
-utgLab      (utg and labels, labelColor = na, textColor = bullColi)     ,   wrap(utg and boxes, borderColor = bullBor, bgColor = bullBg, barsBack =3)
-dtgLab      (dtg and labels, labelColor = na, textColor = bearColi)     ,   wrap(dtg and boxes, borderColor = bearBor, bgColor = bearBg, barsBack =3)
-rtmLab      (rtm and labels, labelColor = na, textColor = bullColi)     ,   wrap(rtm and boxes, borderColor = bullBor, bgColor = bullBg, barsBack =5)
-ftmLab      (ftm and labels, labelColor = na, textColor = bearColi)     ,   wrap(ftm and boxes, borderColor = bearBor, bgColor = bearBg, barsBack =5)
-rwLab       (rw  and labels, labelColor = na, textColor = bullColi)     ,   wrap(rw  and boxes, borderColor = bullBor, bgColor = bullBg, barsBack =2)
-fwLab       (fw  and labels, labelColor = na, textColor = bearColi)     ,   wrap(fw  and boxes, borderColor = bearBor, bgColor = bearBg, barsBack =2)
-kwLab       (kw  and labels, labelColor = na, textColor = bullColi)     ,   wrap(kw  and boxes, borderColor = bullBor, bgColor = bullBg, barsBack =2)
-kbLab       (kb  and labels, labelColor = na, textColor = bearColi)     ,   wrap(kb  and boxes, borderColor = bearBor, bgColor = bearBg, barsBack =2)
-
-llsLab      (ll  and labels, labelColor = na, textColor = bullColi)     ,   wrap(ll  and boxes, borderColor = bullBor, bgColor = bullBg)
-lusLab      (lu  and labels, labelColor = na, textColor = bearColi)     ,   wrap(lu  and boxes, borderColor = bearBor, bgColor = bearBg)
-nwLab       (nw  and labels, labelColor = na, textColor = bullColi)     ,   wrap(nw  and boxes, borderColor = bullBor, bgColor = bullBg, barsBack =2)
-nbLab       (nb  and labels, labelColor = na, textColor = bearColi)     ,   wrap(nb  and boxes, borderColor = bearBor, bgColor = bearBg, barsBack =2)
-wsLab       (ws  and labels, labelColor = na, textColor = bullColi)     ,   wrap(ws  and boxes, borderColor = bullBor, bgColor = bullBg, barsBack =3)
-bcLab       (bc  and labels, labelColor = na, textColor = bearColi)     ,   wrap(bc  and boxes, borderColor = bearBor, bgColor = bearBg, barsBack =3)
-tswLab      (tsw and labels, labelColor = na, textColor = bullColi)     ,   wrap(tsw and boxes, borderColor = bullBor, bgColor = bullBg, barsBack =3)
-tsbLab      (tsb and labels, labelColor = na, textColor = bearColi)     ,   wrap(tsb and boxes, borderColor = bearBor, bgColor = bearBg, barsBack =3)
-insLab      (ib  and labels, labelColor = na, textColor = neutColi)     ,   wrap(ib  and boxes, borderColor = neutBor, bgColor = neutBg, barsBack =2)
-dinLab      (dib and labels, labelColor = na, textColor = neutColi)     ,   wrap(dib and boxes, borderColor = neutBor, bgColor = neutBg, barsBack =3)
-
-_alert      (d      ,   'Doji on '                  )
-_alert      (bew    ,   'Bullish Engulfing on '     )
-_alert      (beb    ,   'Bearish Engulfing on '     )
-_alert      (h      ,   'Hammer candle on '         )
-_alert      (ss     ,   'Shooting star on '         )
-_alert      (dd     ,   'Dragonfly Doji on '        )
-_alert      (gd     ,   'Gravestone Doji on '       )
-_alert      (tb     ,   'Tweezer Bottom on '        )
-_alert      (tt     ,   'Tweezer Top on '           )
-_alert      (stw    ,   'White Spinning Top on '    )
-_alert      (stb    ,   'Black Spinning Top on '    )
-_alert      (ms     ,   'Morning Star on '          )
-_alert      (es     ,   'Evening Star on '          )
-_alert      (bhw    ,   'Bullish Harami on '        )
-_alert      (bhb    ,   'Bearish Harami on '        )
-_alert      (hcw    ,   'Bullish Harami Cross on '  )
-_alert      (hcb    ,   'Bearish Harami Cross on '  )
-_alert      (mw     ,   'Bullish Marubozu on '      )
-_alert      (mb     ,   'Bearish Marubozu on '      )
-_alert      (abw    ,   'Bullish Abandoned Baby on ')
-_alert      (abb    ,   'Bearish Abandoned Baby on ')
-_alert      (p      ,   'Piercing on '              )
-_alert      (dcc    ,   'Dark Cloud Cover on '      )
-_alert      (utg    ,   'Upside Tasuki Gap on '     )
-_alert      (dtg    ,   'Downside Tasuki Gap on '   )
-_alert      (rtm    ,   'Rising Three Methods on '  )
-_alert      (ftm    ,   'Falling Three Methods on ' )
-_alert      (rw     ,   'Rising Window on '         )
-_alert      (fw     ,   'Falling Window '           )
-_alert      (kw     ,   'Kicking Bull on '          )
-_alert      (kb     ,   'Kicking Bear on '          )
-_alert      (tsb    ,   'Bearish Tasuki Gap on '    )
-_alert      (tsw    ,   'Bullish Tasuki Gap on '    )
-_alert      (ib     ,   'Inside Bar on '            )
-_alert      (dib    ,   'Double Inside Bar on '     )
\ No newline at end of file
+
+d       =   enableD                        ? doji              (dojiSize               =   dojiSize                        ,   dojiWickSize                  = dojiWickSize) : false
+bew     =   enableBew and upTrendOrAny     ? bullEngulf        (maxRejectWick          =   rejectWickMax                   ,   mustEngulfWick                = ecWick) : false
+beb     =   enableBeb and downTrendOrAny   ? bearEngulf        (maxRejectWick          =   rejectWickMax                   ,   mustEngulfWick                = ecWick) : false
+h       =   enableH and downTrendOrAny     ? hammer            (ratio                  =   hammerFib                       ,   shadowPercent                 = hsShadowPerc) : false
+ss      =   enableSs and upTrendOrAny      ? star              (ratio                  =   hammerFib                       ,   shadowPercent                 = hsShadowPerc) : false
+dd      =   enableDd                       and bodyIsDoji and topWickSize <= bodySize
+gd      =   enableGd                       and bodyIsDoji and bottomWickSize <= bodySize
+tb      =   enableTb and downTrendOrAny1   ? tweezerBottom     (closeUpperHalf         =   closeHalf) : false
+tt      =   enableTt and upTrendOrAny1     ? tweezerTop        (closeLowerHalf         =   closeHalf) : false
+stw     =   enableStw                      ? spinningTopBull   (wickSize               =   spinWick) : false
+stb     =   enableStb                      ? spinningTopBear   (wickSize               =   spinWick) : false
+ms      =   enableMs and downTrendOrAny    ? morningStar       () : false
+es      =   enableEs and upTrendOrAny      ? eveningStar       () : false
+bhw     =   enableBhw and downTrendOrAny1  ? haramiBull        () : false
+bhb     =   enableBhb and upTrendOrAny1    ? haramiBear        () : false
+hcw     =   enableHcw and downTrendOrAny1  ? haramiBullCross   () : false
+hcb     =   enableHcb and upTrendOrAny1    ? haramiBearCross   () : false
+mw      =   enableMw                       and maruBull
+mb      =   enableMb                       and maruBear
+abw     =   enableAbw and downTrendOrAny1  ? abandonedBull     () : false
+abb     =   enableAbb and upTrendOrAny1    ? abandonedBear     () : false
+p       =   enableP and downTrendOrAny1    ? piercing          () : false
+dcc     =   enableDcc and upTrendOrAny1    ? darkCloudCover    () : false
+utg     =   enableUtg and upTrendOrAny     ? tasukiBull        () : false
+dtg     =   enableDtg and downTrendOrAny   ? tasukiBear        () : false
+rtm     =   enableRtm and upTrendOrAny4    ? risingThree       () : false
+ftm     =   enableFtm and downTrendOrAny4  ? fallingThree      () : false
+rw      =   enableRw and upTrendOrAny1     ? risingWindow      () : false
+fw      =   enableFw and downTrendOrAny1   ? fallingWindow     () : false
+kw      =   enableKw                       and maruBear[1] and maruBull and upGap
+kb      =   enableKb                       and maruBull[1] and maruBear and dwnGap
+ll      =   enableLl                       ? lls               (ratio                  =   lsRatio) : false
+lu      =   enableLu                       ? lus               (ratio                  =   lsRatio) : false
+nw      =   enableNw and upTrendOrAny      ? bullNeck          () : false
+nb      =   enableNb and downTrendOrAny    ? bearNeck          () : false
+ws      =   enableWs                       ? soldiers          (wickSize               =   scWick) : false
+bc      =   enableBc                       ? crows             (wickSize               =   scWick) : false
+tsw     =   enableTsw and downTrendOrAny2  ? triStarBull       () : false
+tsb     =   enableTsb and upTrendOrAny2    ? triStarBear       () : false
+ib      =   enableIb                       and isInside
+dib     =   enableDib                      and isInside and isInside[1]
+
+// on most bars nothing fires, so drawing and alerting both sit behind this one check
+anyFired            =   d or bew or beb or h or ss or dd or gd or tb or tt or stw or stb or ms or
+                         es or bhw or bhb or hcw or hcb or mw or mb or abw or abb or p or dcc or utg or
+                         dtg or rtm or ftm or rw or fw or kw or kb or ll or lu or nw or nb or ws or
+                         bc or tsw or tsb or ib or dib
+
+// Pine has no function references, so the label of a pattern id is picked by switch
+_patLab(int id, color textColor) =>
+    switch id
+        ID_DOJI               => dLab   (true, na, textColor)
+        ID_BULL_ENGULF        => bewLab (true, na, textColor)
+        ID_BEAR_ENGULF        => bebLab (true, na, textColor)
+        ID_HAMMER             => hLab   (true, na, textColor)
+        ID_STAR               => ssLab  (true, na, textColor)
+        ID_DRAGONFLY_DOJI     => ddLab  (true, na, textColor)
+        ID_GRAVESTONE_DOJI    => gdLab  (true, na, textColor)
+        ID_TWEEZER_BOTTOM     => tbLab  (true, na, textColor)
+        ID_TWEEZER_TOP        => ttLab  (true, na, textColor)
+        ID_SPINNING_TOP_BULL  => stwLab (true, na, textColor)
+        ID_SPINNING_TOP_BEAR  => stbLab (true, na, textColor)
+        ID_SPINNING_TOP       => stLab  (true, na, textColor)
+        ID_MORNING_STAR       => msLab  (true, na, textColor)
+        ID_EVENING_STAR       => esLab  (true, na, textColor)
+        ID_HARAMI_BULL        => hwLab  (true, na, textColor)
+        ID_HARAMI_BEAR        => hbLab  (true, na, textColor)
+        ID_HARAMI_BULL_CROSS  => hcwLab (true, na, textColor)
+        ID_HARAMI_BEAR_CROSS  => hcbLab (true, na, textColor)
+        ID_MARUBULLZU         => mwLab  (true, na, textColor)
+        ID_MARUBEARZU         => mbLab  (true, na, textColor)
+        ID_ABANDONED_BULL     => abwLab (true, na, textColor)
+        ID_ABANDONED_BEAR     => abbLab (true, na, textColor)
+        ID_PIERCING           => pLab   (true, na, textColor)
+        ID_DARK_CLOUD_COVER   => dccLab (true, na, textColor)
+        ID_TASUKI_BULL        => utgLab (true, na, textColor)
+        ID_TASUKI_BEAR        => dtgLab (true, na, textColor)
+        ID_RISING_THREE       => rtmLab (true, na, textColor)
+        ID_FALLING_THREE      => ftmLab (true, na, textColor)
+        ID_RISING_WINDOW      => rwLab  (true, na, textColor)
+        ID_FALLING_WINDOW     => fwLab  (true, na, textColor)
+        ID_KICKING_BULL       => kwLab  (true, na, textColor)
+        ID_KICKING_BEAR       => kbLab  (true, na, textColor)
+        ID_LLS                => llsLab (true, na, textColor)
+        ID_LUS                => lusLab (true, na, textColor)
+        ID_BULL_NECK          => nwLab  (true, na, textColor)
+        ID_BEAR_NECK          => nbLab  (true, na, textColor)
+        ID_SOLDIERS           => wsLab  (true, na, textColor)
+        ID_CROWS              => bcLab  (true, na, textColor)
+        ID_TRI_STAR_BULL      => tswLab (true, na, textColor)
+        ID_TRI_STAR_BEAR      => tsbLab (true, na, textColor)
+        ID_INSIDE_BAR         => insLab (true, na, textColor)
+        ID_DOUBLE_INSIDE      => dinLab (true, na, textColor)
+
+// pattern classes index the color lookups; the spec table is built on the first bar only
+const int CLS_BULL  = 0
+const int CLS_BEAR  = 1
+const int CLS_NEUT  = 2
+
+var color[] textColors  =   array.from(bullColi, bearColi, neutColi)
+var color[] borColors   =   array.from(bullBor, bearBor, neutBor)
+var color[] bgColors    =   array.from(bullBg, bearBg, neutBg)
+
+type PatSpec
+    int id
+    int cls
+    int bb = 1
+    string msg = ""
+
+// wrap()'s extremes for every box depth a spec uses, taken on every bar
+// so the ta.highest/ta.lowest history stays consistent when only some patterns fire
+float hi2           =   ta.highest(high, 2)
+float lo2           =   ta.lowest (low , 2)
+float hi3           =   ta.highest(high, 3)
+float lo3           =   ta.lowest (low , 3)
+float hi5           =   ta.highest(high, 5)
+float lo5           =   ta.lowest (low , 5)
+
+_boxRange(int bb) =>
+    switch bb
+        1 => [high, low]
+        2 => [hi2, lo2]
+        3 => [hi3, lo3]
+        5 => [hi5, lo5]
+        =>
+            runtime.error("PatSpec.bb must be 1, 2, 3 or 5, got " + str.tostring(bb))
+            [float(na), float(na)]
+
+drawPat(PatSpec spec) =>
+    if labels
+        _patLab(spec.id, array.get(textColors, spec.cls))
+    if boxes
+        [top, bottom] = _boxRange(spec.bb)
+        _box(top, bottom, spec.bb, array.get(borColors, spec.cls), array.get(bgColors, spec.cls))
+
+var array<PatSpec> pats = array.from(
+     PatSpec.new(ID_DOJI,              CLS_NEUT, 1, 'Doji on '),
+     PatSpec.new(ID_BULL_ENGULF,       CLS_BULL, 2, 'Bullish Engulfing on '),
+     PatSpec.new(ID_BEAR_ENGULF,       CLS_BEAR, 2, 'Bearish Engulfing on '),
+     PatSpec.new(ID_HAMMER,            CLS_BULL, 1, 'Hammer candle on '),
+     PatSpec.new(ID_STAR,              CLS_BEAR, 1, 'Shooting star on '),
+     PatSpec.new(ID_DRAGONFLY_DOJI,    CLS_BULL, 2, 'Dragonfly Doji on '),
+     PatSpec.new(ID_GRAVESTONE_DOJI,   CLS_BEAR, 2, 'Gravestone Doji on '),
+     PatSpec.new(ID_TWEEZER_BOTTOM,    CLS_BULL, 2, 'Tweezer Bottom on '),
+     PatSpec.new(ID_TWEEZER_TOP,       CLS_BEAR, 2, 'Tweezer Top on '),
+     PatSpec.new(ID_SPINNING_TOP_BULL, CLS_NEUT, 1, 'White Spinning Top on '),
+     PatSpec.new(ID_SPINNING_TOP_BEAR, CLS_NEUT, 1, 'Black Spinning Top on '),
+     PatSpec.new(ID_MORNING_STAR,      CLS_BULL, 3, 'Morning Star on '),
+     PatSpec.new(ID_EVENING_STAR,      CLS_BEAR, 3, 'Evening Star on '),
+     PatSpec.new(ID_HARAMI_BULL,       CLS_BULL, 2, 'Bullish Harami on '),
+     PatSpec.new(ID_HARAMI_BEAR,       CLS_BEAR, 2, 'Bearish Harami on '),
+     PatSpec.new(ID_HARAMI_BULL_CROSS, CLS_BULL, 2, 'Bullish Harami Cross on '),
+     PatSpec.new(ID_HARAMI_BEAR_CROSS, CLS_BEAR, 2, 'Bearish Harami Cross on '),
+     PatSpec.new(ID_MARUBULLZU,        CLS_BULL, 1, 'Bullish Marubozu on '),
+     PatSpec.new(ID_MARUBEARZU,        CLS_BEAR, 1, 'Bearish Marubozu on '),
+     PatSpec.new(ID_ABANDONED_BULL,    CLS_BULL, 3, 'Bullish Abandoned Baby on '),
+     PatSpec.new(ID_ABANDONED_BEAR,    CLS_BEAR, 3, 'Bearish Abandoned Baby on '),
+     PatSpec.new(ID_PIERCING,          CLS_BULL, 2, 'Piercing on '),
+     PatSpec.new(ID_DARK_CLOUD_COVER,  CLS_BEAR, 2, 'Dark Cloud Cover on '),
+     PatSpec.new(ID_TASUKI_BULL,       CLS_BULL, 3, 'Upside Tasuki Gap on '),
+     PatSpec.new(ID_TASUKI_BEAR,       CLS_BEAR, 3, 'Downside Tasuki Gap on '),
+     PatSpec.new(ID_RISING_THREE,      CLS_BULL, 5, 'Rising Three Methods on '),
+     PatSpec.new(ID_FALLING_THREE,     CLS_BEAR, 5, 'Falling Three Methods on '),
+     PatSpec.new(ID_RISING_WINDOW,     CLS_BULL, 2, 'Rising Window on '),
+     PatSpec.new(ID_FALLING_WINDOW,    CLS_BEAR, 2, 'Falling Window '),
+     PatSpec.new(ID_KICKING_BULL,      CLS_BULL, 2, 'Kicking Bull on '),
+     PatSpec.new(ID_KICKING_BEAR,      CLS_BEAR, 2, 'Kicking Bear on '),
+     PatSpec.new(ID_LLS,               CLS_BULL, 1),
+     PatSpec.new(ID_LUS,               CLS_BEAR, 1),
+     PatSpec.new(ID_BULL_NECK,         CLS_BULL, 2),
+     PatSpec.new(ID_BEAR_NECK,         CLS_BEAR, 2),
+     PatSpec.new(ID_SOLDIERS,          CLS_BULL, 3),
+     PatSpec.new(ID_CROWS,             CLS_BEAR, 3),
+     PatSpec.new(ID_TRI_STAR_BULL,     CLS_BULL, 3, 'Bullish Tasuki Gap on '),
+     PatSpec.new(ID_TRI_STAR_BEAR,     CLS_BEAR, 3, 'Bearish Tasuki Gap on '),
+     PatSpec.new(ID_INSIDE_BAR,        CLS_NEUT, 2, 'Inside Bar on '),
+     PatSpec.new(ID_DOUBLE_INSIDE,     CLS_NEUT, 3, 'Double Inside Bar on '))
+
+anyAlert            =   anyFired and (d or bew or beb or h or ss or dd or gd or tb or tt or stw or stb or ms or
+                         es or bhw or bhb or hcw or hcb or mw or mb or abw or abb or p or dcc or utg or
+                         dtg or rtm or ftm or rw or fw or kw or kb or tsb or tsw or ib or dib)
+
+if anyFired
+    // one entry per spec, in the same order
+    fired               =   array.from(d, bew, beb, h, ss, dd, gd, tb, tt, stw, stb, ms,
+                             es, bhw, bhb, hcw, hcb, mw, mb, abw, abb, p, dcc, utg,
+                             dtg, rtm, ftm, rw, fw, kw, kb, ll, lu, nw, nb, ws,
+                             bc, tsw, tsb, ib, dib)
+
+    if drawEnabled
+        for [i, spec] in pats
+            if array.get(fired, i)
+                drawPat(spec)
+
+    // specs with an empty msg are drawn but never alerted
+    if anyAlert
+        closeStr        =   str.tostring(close)
+        for [i, spec] in pats
+            if spec.msg != "" and array.get(fired, i)
+                alert(spec.msg + tfSuffix + closeStr, alertMode)
\ No newline at end of file
@@ -0,0 +1,815 @@
+"""NumPy port of the candle measurements and detectors in candlePatterns.py.
+
+Pine evaluates every measurement once per bar. Here each one is a single
+vectorized pass over whole open/high/low/close histories, so a chart of N
+bars costs a handful of ufunc calls instead of N interpreter round trips.
+"""
+
+from collections import namedtuple
+from functools import lru_cache
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+except ImportError:
+    # Numba is optional: without it the kernels below run as plain Python.
+    prange = range
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
+
+# Constants of the per-bar arithmetic, hoisted so no loop divides by them.
+_ALPHA14     = 2.0 / 15.0   # ta.ema(bodySize, 14)
+_PCT         = 0.01         # x / 100 as x * _PCT
+_TWEEZER_TOL = 0.05         # bodyAvg * 0.05 in the tweezer and neck tests
+
+# LLVM fast-math flags of the compiled kernels. nnan and ninf are left out:
+# with them NaN comparisons are undefined, and a NaN bar must fail every
+# test the way Pine's na does.
+_FASTMATH    = {"contract", "reassoc", "arcp"}
+
+# Bit positions of the boolean measurements packed into the per-bar "flags"
+# word of candle_measures. One uint64 per bar replaces a bool array per flag.
+UP_CANDLE     = np.uint64(1 << 0)
+DWN_CANDLE    = np.uint64(1 << 1)
+TALL_BODY     = np.uint64(1 << 2)
+SHORT_BODY    = np.uint64(1 << 3)
+BODY_IS_DOJI  = np.uint64(1 << 4)
+TOP_SHADOW    = np.uint64(1 << 5)
+BOTTOM_SHADOW = np.uint64(1 << 6)
+BODY_UP_GAP   = np.uint64(1 << 7)
+BODY_DWN_GAP  = np.uint64(1 << 8)
+UP_GAP        = np.uint64(1 << 9)
+DWN_GAP       = np.uint64(1 << 10)
+
+_FLAG_KEYS = (
+    (UP_CANDLE,     "up_candle"),
+    (DWN_CANDLE,    "dwn_candle"),
+    (TALL_BODY,     "tall_body"),
+    (SHORT_BODY,    "short_body"),
+    (BODY_IS_DOJI,  "body_is_doji"),
+    (TOP_SHADOW,    "top_shadow"),
+    (BOTTOM_SHADOW, "bottom_shadow"),
+    (BODY_UP_GAP,   "body_up_gap"),
+    (BODY_DWN_GAP,  "body_dwn_gap"),
+    (UP_GAP,        "up_gap"),
+    (DWN_GAP,       "dwn_gap"),
+)
+
+# Single-bar detections that scan() reads back at a lookback. They only live
+# in the kernel's private flags words, never in candle_measures.
+_DOJI         = np.uint64(1 << 11)
+_MARU_BULL    = np.uint64(1 << 12)
+_MARU_BEAR    = np.uint64(1 << 13)
+_INSIDE_BAR   = np.uint64(1 << 14)
+_SOLDIER_WICK = np.uint64(1 << 15)
+_CROW_WICK    = np.uint64(1 << 16)
+
+# Pattern bits of the words returned by scan(), in candlePatterns.py order.
+PATTERNS = (
+    "doji", "bull_engulf", "bear_engulf", "hammer", "star", "dragonfly_doji",
+    "gravestone_doji", "tweezer_bottom", "tweezer_top", "spinning_top_bull",
+    "spinning_top_bear", "spinning_top", "morning_star", "evening_star",
+    "harami_bull", "harami_bear", "harami_bull_cross", "harami_bear_cross",
+    "marubullzu", "marubearzu", "abandoned_bull", "abandoned_bear", "piercing",
+    "dark_cloud_cover", "tasuki_bull", "tasuki_bear", "rising_three",
+    "falling_three", "rising_window", "falling_window", "kicking_bull",
+    "kicking_bear", "lls", "lus", "bull_neck", "bear_neck", "soldiers", "crows",
+    "tri_star_bull", "tri_star_bear", "inside_bar", "double_inside",
+)
+
+PAT_DOJI              = np.uint64(1 << 0)
+PAT_BULL_ENGULF       = np.uint64(1 << 1)
+PAT_BEAR_ENGULF       = np.uint64(1 << 2)
+PAT_HAMMER            = np.uint64(1 << 3)
+PAT_STAR              = np.uint64(1 << 4)
+PAT_DRAGONFLY_DOJI    = np.uint64(1 << 5)
+PAT_GRAVESTONE_DOJI   = np.uint64(1 << 6)
+PAT_TWEEZER_BOTTOM    = np.uint64(1 << 7)
+PAT_TWEEZER_TOP       = np.uint64(1 << 8)
+PAT_SPINNING_TOP_BULL = np.uint64(1 << 9)
+PAT_SPINNING_TOP_BEAR = np.uint64(1 << 10)
+PAT_SPINNING_TOP      = np.uint64(1 << 11)
+PAT_MORNING_STAR      = np.uint64(1 << 12)
+PAT_EVENING_STAR      = np.uint64(1 << 13)
+PAT_HARAMI_BULL       = np.uint64(1 << 14)
+PAT_HARAMI_BEAR       = np.uint64(1 << 15)
+PAT_HARAMI_BULL_CROSS = np.uint64(1 << 16)
+PAT_HARAMI_BEAR_CROSS = np.uint64(1 << 17)
+PAT_MARUBULLZU        = np.uint64(1 << 18)
+PAT_MARUBEARZU        = np.uint64(1 << 19)
+PAT_ABANDONED_BULL    = np.uint64(1 << 20)
+PAT_ABANDONED_BEAR    = np.uint64(1 << 21)
+PAT_PIERCING          = np.uint64(1 << 22)
+PAT_DARK_CLOUD_COVER  = np.uint64(1 << 23)
+PAT_TASUKI_BULL       = np.uint64(1 << 24)
+PAT_TASUKI_BEAR       = np.uint64(1 << 25)
+PAT_RISING_THREE      = np.uint64(1 << 26)
+PAT_FALLING_THREE     = np.uint64(1 << 27)
+PAT_RISING_WINDOW     = np.uint64(1 << 28)
+PAT_FALLING_WINDOW    = np.uint64(1 << 29)
+PAT_KICKING_BULL      = np.uint64(1 << 30)
+PAT_KICKING_BEAR      = np.uint64(1 << 31)
+PAT_LLS               = np.uint64(1 << 32)
+PAT_LUS               = np.uint64(1 << 33)
+PAT_BULL_NECK         = np.uint64(1 << 34)
+PAT_BEAR_NECK         = np.uint64(1 << 35)
+PAT_SOLDIERS          = np.uint64(1 << 36)
+PAT_CROWS             = np.uint64(1 << 37)
+PAT_TRI_STAR_BULL     = np.uint64(1 << 38)
+PAT_TRI_STAR_BEAR     = np.uint64(1 << 39)
+PAT_INSIDE_BAR        = np.uint64(1 << 40)
+PAT_DOUBLE_INSIDE     = np.uint64(1 << 41)
+
+
+class OHLC:
+    """Open/high/low/close history stored as four contiguous arrays.
+
+    Prices are kept as float32 when price_dtype finds that precise enough,
+    which halves the bytes every measurement pass reads, and as float64
+    otherwise. Iterating yields o, h, l, c, so candle_measures(*bars) and
+    scan(*bars) accept an OHLC directly.
+    """
+
+    __slots__ = ("o", "h", "l", "c")
+
+    def __init__(self, o, h, l, c, dtype=None):
+        if dtype is None:
+            dtype = price_dtype(o, h, l, c)
+        self.o, self.h, self.l, self.c = (np.ascontiguousarray(a, dtype=dtype) for a in (o, h, l, c))
+
+    @classmethod
+    def from_records(cls, bars, dtype=None):
+        """Builds the history from per-bar records with open/high/low/close attributes."""
+        rows = np.array([(b.open, b.high, b.low, b.close) for b in bars], dtype=np.float64)
+        return cls(*rows.reshape(-1, 4).T, dtype=dtype)
+
+    def __len__(self):
+        return self.o.size
+
+    def __iter__(self):
+        return iter((self.o, self.h, self.l, self.c))
+
+
+def price_dtype(o, h, l, c):
+    """Returns float32 when it resolves the candles of a history, float64 otherwise.
+
+    The measurements are small differences of prices near the price level,
+    so float32 is only used while its spacing at the largest price stays
+    under 1% of the smallest nonzero high - low range.
+    """
+    h, l = np.asarray(h, dtype=np.float64), np.asarray(l, dtype=np.float64)
+    rng = h - l
+    rng = rng[rng > 0.0]
+    if rng.size == 0:
+        return np.float32
+    top = max(np.abs(np.asarray(a, dtype=np.float64)).max() for a in (o, h, l, c))
+    if top >= np.finfo(np.float32).max or np.spacing(np.float32(top)) > rng.min() * _PCT:
+        return np.float64
+    return np.float32
+
+
+def _as_prices(o, h, l, c):
+    # float32 histories (see OHLC) stay float32; anything else runs in float64.
+    dtype = np.float32 if all(np.asarray(a).dtype == np.float32 for a in (o, h, l, c)) else np.float64
+    return tuple(np.ascontiguousarray(a, dtype=dtype) for a in (o, h, l, c))
+
+
+@njit(cache=True, fastmath=_FASTMATH)
+def ema(x, alpha):
+    """Exponential moving average seeded with the first value, as ta.ema does."""
+    y = np.empty_like(x)
+    if x.size == 0:
+        return y
+    y[0] = x[0]
+    for i in range(1, x.size):
+        y[i] = alpha * x[i] + (1.0 - alpha) * y[i - 1]
+    return y
+
+
+def candle_measures(o, h, l, c):
+    """Returns the "Candle Measurements" block of candlePatterns.py for every bar.
+
+    o, h, l, c are equally sized open/high/low/close arrays, e.g. *OHLC(...).
+    The result is a dict of arrays (structure of arrays) keyed by measurement
+    name, in float32 for float32 prices and float64 otherwise; the input
+    prices are included under "open", "high", "low" and "close".
+    """
+    o, h, l, c = _as_prices(o, h, l, c)
+    n = o.size
+
+    m = {
+        "open":          o,
+        "high":          h,
+        "low":           l,
+        "close":         c,
+        "body_high":     np.empty(n, dtype=o.dtype),
+        "body_low":      np.empty(n, dtype=o.dtype),
+        "body_size":     np.empty(n, dtype=o.dtype),
+        "top_wick":      np.empty(n, dtype=o.dtype),
+        "bottom_wick":   np.empty(n, dtype=o.dtype),
+        "candle_size":   np.empty(n, dtype=o.dtype),
+        "body_pcnt":     np.empty(n, dtype=o.dtype),
+        "middle_body":   np.empty(n, dtype=o.dtype),
+        "tall_body":     np.empty(n, dtype=np.bool_),
+        "short_body":    np.empty(n, dtype=np.bool_),
+        "top_shadow":    np.empty(n, dtype=np.bool_),
+        "bottom_shadow": np.empty(n, dtype=np.bool_),
+        "body_is_doji":  np.empty(n, dtype=np.bool_),
+        "up_candle":     np.empty(n, dtype=np.bool_),
+        "dwn_candle":    np.empty(n, dtype=np.bool_),
+        "body_up_gap":   np.zeros(n, dtype=np.bool_),
+        "body_dwn_gap":  np.zeros(n, dtype=np.bool_),
+        "up_gap":        np.zeros(n, dtype=np.bool_),
+        "dwn_gap":       np.zeros(n, dtype=np.bool_),
+    }
+    scratch = np.empty(n, dtype=o.dtype)
+
+    # high >= max(close, open) and low <= min(close, open) always hold, so the
+    # sizes need no math.abs and all of them reuse the body high and low.
+    np.maximum  (c, o,                          out=m["body_high"])
+    np.minimum  (c, o,                          out=m["body_low"])
+    np.subtract (m["body_high"], m["body_low"], out=m["body_size"])
+    np.subtract (h, m["body_high"],             out=m["top_wick"])
+    np.subtract (m["body_low"], l,              out=m["bottom_wick"])
+    np.subtract (h, l,                          out=m["candle_size"])
+
+    # ta.ema is a serial recurrence, so it runs as a compiled loop instead.
+    m["body_avg"] = ema(m["body_size"], _ALPHA14)
+    np.greater  (m["body_size"], m["body_avg"], out=m["tall_body"])
+    np.less     (m["body_size"], m["body_avg"], out=m["short_body"])
+
+    # A zero range bar has no body percentage (na in Pine), which NaN mirrors.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        np.divide(m["body_size"], m["candle_size"], out=m["body_pcnt"])
+    np.multiply (m["body_pcnt"], 100.0,         out=m["body_pcnt"])
+
+    np.multiply (m["body_size"], 5 * _PCT,      out=scratch)
+    np.greater  (m["top_wick"], scratch,        out=m["top_shadow"])
+    np.greater  (m["bottom_wick"], scratch,     out=m["bottom_shadow"])
+
+    np.multiply (m["body_size"], 0.5,           out=m["middle_body"])
+    np.add      (m["middle_body"], m["body_low"], out=m["middle_body"])
+
+    np.less_equal(m["body_pcnt"], 5.0,          out=m["body_is_doji"])
+    np.greater  (c, o,                          out=m["up_candle"])
+    np.less     (c, o,                          out=m["dwn_candle"])
+
+    # The [1] lookbacks compare two offset views and write straight into bars
+    # 1..n-1 of the gap arrays; bar 0 has no prior bar and stays false.
+    bh, bl = m["body_high"], m["body_low"]
+    np.less     (bh[:-1], bl[1:],               out=m["body_up_gap"][1:])
+    np.less     (bh[1:], bl[:-1],               out=m["body_dwn_gap"][1:])
+    np.greater  (l[1:], h[:-1],                 out=m["up_gap"][1:])
+    np.greater  (l[:-1], h[1:],                 out=m["dwn_gap"][1:])
+
+    m["flags"] = pack_flags(m)
+    return m
+
+
+def pack_flags(m):
+    """Packs the boolean measurements of m into one uint64 word per bar."""
+    flags = np.zeros(m["open"].size, dtype=np.uint64)
+    for bit, key in _FLAG_KEYS:
+        np.bitwise_or(flags, bit, out=flags, where=m[key])
+    return flags
+
+
+def _has(flags, bits):
+    # True where every bit of bits is set, i.e. several same-bar terms at once.
+    return (flags & bits) == bits
+
+
+def _lagged(n, k, value):
+    # Pine's [k] is na on the first k bars, so those bars never match.
+    out = np.zeros(n, dtype=np.bool_)
+    out[k:] = value
+    return out
+
+
+# ================================== #
+# ---> Parameterized Detectors <---- #
+# ================================== #
+
+# Detectors with user parameters compile one kernel per parameter set. The
+# parameters are closure constants of the kernel, so Numba folds ratio / 100
+# and friends at compile time instead of dividing on every bar. This is the
+# partial evaluation numba.generated_jit used to provide; that decorator is
+# gone from current Numba releases.
+
+@lru_cache(maxsize=None)
+def _doji_kernel(doji_size, doji_wick_size):
+    @njit(fastmath=_FASTMATH, boundscheck=False)
+    def kernel(body, rng, tw, bw, out):
+        for i in range(body.size):
+            out[i] = rng[i] != 0.0 and body[i] * 100.0 <= doji_size * rng[i] \
+                     and tw[i] <= bw[i] * doji_wick_size and bw[i] <= tw[i] * doji_wick_size
+    return kernel
+
+
+@lru_cache(maxsize=None)
+def _hammer_kernel(ratio, shadow_percent):
+    r = ratio * _PCT
+    s = shadow_percent * _PCT
+
+    @njit(fastmath=_FASTMATH, boundscheck=False)
+    def kernel(l, h, tw, bl, body, out):
+        for i in range(body.size):
+            out[i] = body[i] > 0.0 and bl[i] >= (l[i] - h[i]) * r + h[i] and tw[i] <= s * body[i]
+    return kernel
+
+
+@lru_cache(maxsize=None)
+def _spinning_top_kernel(wick_size):
+    @njit(fastmath=_FASTMATH, boundscheck=False)
+    def kernel(rng, tw, bw, doji, out):
+        for i in range(rng.size):
+            out[i] = bw[i] * 100.0 >= rng[i] * wick_size and tw[i] * 100.0 >= rng[i] * wick_size and not doji[i]
+    return kernel
+
+
+def doji(m, doji_size=5.0, doji_wick_size=2.0):
+    """Detects "Doji" candle patterns."""
+    out = np.empty(m["open"].size, dtype=np.bool_)
+    _doji_kernel(float(doji_size), float(doji_wick_size))(
+        m["body_size"], m["candle_size"], m["top_wick"], m["bottom_wick"], out)
+    return out
+
+
+def hammer(m, ratio=33, shadow_percent=5.0):
+    """Detects "Hammer" candle patterns."""
+    out = np.empty(m["open"].size, dtype=np.bool_)
+    _hammer_kernel(float(ratio), float(shadow_percent))(
+        m["low"], m["high"], m["top_wick"], m["body_low"], m["body_size"], out)
+    return out
+
+
+def spinning_top(m, wick_size=34):
+    """Detects "Spinning Top" candle patterns."""
+    out = np.empty(m["open"].size, dtype=np.bool_)
+    _spinning_top_kernel(float(wick_size))(
+        m["candle_size"], m["top_wick"], m["bottom_wick"], m["body_is_doji"], out)
+    return out
+
+
+def spinning_top_bull(m, wick_size=34):
+    """Detects "Bullish Spinning Top" candle patterns."""
+    return spinning_top(m, wick_size) & m["up_candle"]
+
+
+def spinning_top_bear(m, wick_size=34):
+    """Detects "Bearish Spinning Top" candle patterns."""
+    return spinning_top(m, wick_size) & m["dwn_candle"]
+
+
+# ================================== #
+# -----> Multi-bar Predicates <----- #
+# ================================== #
+
+# Every predicate below takes the dict returned by candle_measures. A Pine
+# lookback x[k] on the current bar becomes the slice x[K - k:n - k] where K is
+# the deepest lookback, so all terms line up on the same bars.
+
+def bull_engulf(m, max_reject_wick=0.0, must_engulf_wick=False):
+    """Detects "Bullish Engulfing" candle patterns."""
+    o, h, c, n = m["open"], m["high"], m["close"], m["open"].size
+    result = (c[:-1] <= o[:-1]) & (c[1:] >= o[:-1]) & (o[1:] <= c[:-1]) & (m["body_size"][1:] > 0)
+    # Disabled filters are dropped here rather than ANDed as all-True masks. The
+    # wick / body < max / 100 rejection test is cross-multiplied (body > 0).
+    if max_reject_wick != 0.0:
+        result &= m["top_wick"][1:] * 100.0 < max_reject_wick * m["body_size"][1:]
+    if must_engulf_wick:
+        result &= c[1:] >= h[:-1]
+    return _lagged(n, 1, result)
+
+
+def bear_engulf(m, max_reject_wick=0.0, must_engulf_wick=False):
+    """Detects "Bearish Engulfing" candle patterns."""
+    o, l, c, n = m["open"], m["low"], m["close"], m["open"].size
+    result = (c[:-1] >= o[:-1]) & (c[1:] <= o[:-1]) & (o[1:] >= c[:-1]) & (m["body_size"][1:] > 0)
+    if max_reject_wick != 0.0:
+        result &= m["bottom_wick"][1:] * 100.0 < max_reject_wick * m["body_size"][1:]
+    if must_engulf_wick:
+        result &= c[1:] <= l[:-1]
+    return _lagged(n, 1, result)
+
+
+def morning_star(m):
+    """Detects "Bullish Morning Star" candle patterns."""
+    f, bh, mid = m["flags"], m["body_high"], m["middle_body"]
+    # Few bars pass the flag tests, so the price tests only run on those bars.
+    hit = _has(f[:-2], TALL_BODY | DWN_CANDLE) & _has(f[1:-1], SHORT_BODY | BODY_DWN_GAP) \
+          & _has(f[2:], TALL_BODY | UP_CANDLE | BODY_UP_GAP)
+    idx = np.flatnonzero(hit)
+    hit[idx] = (bh[idx + 2] >= mid[idx]) & (bh[idx + 2] < bh[idx])
+    return _lagged(f.size, 2, hit)
+
+
+def evening_star(m):
+    """Detects "Bearish Evening Star" candle patterns."""
+    f, bl, mid = m["flags"], m["body_low"], m["middle_body"]
+    hit = _has(f[:-2], TALL_BODY | UP_CANDLE) & _has(f[1:-1], SHORT_BODY | BODY_UP_GAP) \
+          & _has(f[2:], TALL_BODY | DWN_CANDLE | BODY_DWN_GAP)
+    idx = np.flatnonzero(hit)
+    hit[idx] = (bl[idx + 2] <= mid[idx]) & (bl[idx + 2] > bl[idx])
+    return _lagged(f.size, 2, hit)
+
+
+def _inside_prior_body(m):
+    h, l = m["high"], m["low"]
+    return (h[1:] <= m["body_high"][:-1]) & (l[1:] >= m["body_low"][:-1])
+
+
+def harami_bull(m):
+    """Detects "Bullish Harami" candle patterns."""
+    f = m["flags"]
+    return _lagged(f.size, 1, _has(f[:-1], TALL_BODY | DWN_CANDLE) & _has(f[1:], UP_CANDLE | SHORT_BODY)
+                             & _inside_prior_body(m))
+
+
+def harami_bear(m):
+    """Detects "Bearish Harami" candle patterns."""
+    f = m["flags"]
+    return _lagged(f.size, 1, _has(f[:-1], TALL_BODY | UP_CANDLE) & _has(f[1:], DWN_CANDLE | SHORT_BODY)
+                             & _inside_prior_body(m))
+
+
+def harami_bull_cross(m):
+    """Detects "Bullish Harami Cross" candle patterns."""
+    f = m["flags"]
+    return _lagged(f.size, 1, _has(f[:-1], TALL_BODY | DWN_CANDLE) & _has(f[1:], BODY_IS_DOJI)
+                             & _inside_prior_body(m))
+
+
+def harami_bear_cross(m):
+    """Detects "Bearish Harami Cross" candle patterns."""
+    f = m["flags"]
+    return _lagged(f.size, 1, _has(f[:-1], TALL_BODY | UP_CANDLE) & _has(f[1:], BODY_IS_DOJI)
+                             & _inside_prior_body(m))
+
+
+def abandoned_bull(m):
+    """Detects "Bullish Abandoned Baby" candle patterns."""
+    f = m["flags"]
+    return _lagged(f.size, 2, _has(f[:-2], DWN_CANDLE) & _has(f[1:-1], BODY_IS_DOJI | DWN_GAP)
+                             & _has(f[2:], UP_CANDLE | UP_GAP))
+
+
+def abandoned_bear(m):
+    """Detects "Bearish Abandoned Baby" candle patterns."""
+    f = m["flags"]
+    return _lagged(f.size, 2, _has(f[:-2], UP_CANDLE) & _has(f[1:-1], BODY_IS_DOJI | UP_GAP)
+                             & _has(f[2:], DWN_CANDLE | DWN_GAP))
+
+
+def piercing(m):
+    """Detects "Piercing" candle patterns."""
+    f, o, l, c = m["flags"], m["open"], m["low"], m["close"]
+    return _lagged(f.size, 1, _has(f[:-1], DWN_CANDLE | TALL_BODY) & _has(f[1:], UP_CANDLE)
+                             & (o[1:] <= l[:-1]) & (c[1:] > m["middle_body"][:-1]) & (c[1:] < o[:-1]))
+
+
+def dark_cloud_cover(m):
+    """Detects "Dark Cloud Cover" candle patterns."""
+    f, o, h, c = m["flags"], m["open"], m["high"], m["close"]
+    return _lagged(f.size, 1, _has(f[:-1], UP_CANDLE | TALL_BODY) & _has(f[1:], DWN_CANDLE)
+                             & (o[1:] >= h[:-1]) & (c[1:] < m["middle_body"][:-1]) & (c[1:] > o[:-1]))
+
+
+def tasuki_bull(m):
+    """Detects "Upside Tasuki Gap" candle patterns."""
+    f, bl = m["flags"], m["body_low"]
+    return _lagged(f.size, 2, _has(f[:-2], TALL_BODY | UP_CANDLE) & _has(f[1:-1], SHORT_BODY | UP_CANDLE | BODY_UP_GAP)
+                             & _has(f[2:], DWN_CANDLE) & (bl[2:] >= m["body_high"][:-2]) & (bl[2:] <= bl[1:-1]))
+
+
+def tasuki_bear(m):
+    """Detects "Downside Tasuki Gap" candle patterns."""
+    f, bh = m["flags"], m["body_high"]
+    return _lagged(f.size, 2, _has(f[:-2], TALL_BODY | DWN_CANDLE) & _has(f[1:-1], SHORT_BODY | DWN_CANDLE | BODY_DWN_GAP)
+                             & _has(f[2:], UP_CANDLE) & (bh[2:] <= m["body_low"][:-2]) & (bh[2:] >= bh[1:-1]))
+
+
+# ================================== #
+# ---------> Fused Scan <----------- #
+# ================================== #
+
+def scan(o, h, l, c, out_flags=None):
+    """Detects every pattern of candlePatterns.py at its default settings.
+
+    Returns one uint64 per bar (written to out_flags when given) with the
+    PAT_* bit of each pattern detected on that bar. The OHLC arrays are read
+    in two passes: a serial one for bodyAvg and the per-bar measurements, and
+    a parallel one that evaluates the patterns of every bar. Like
+    candle_measures, float32 prices are measured in float32.
+    """
+    o, h, l, c = _as_prices(o, h, l, c)
+    n = o.size
+    avg = np.empty(n, dtype=o.dtype)
+    flags = np.empty(n, dtype=np.uint64)
+    if out_flags is None:
+        out_flags = np.empty(n, dtype=np.uint64)
+    _measure_kernel(o, h, l, c, _ALPHA14, avg, flags)
+    _pattern_kernel(o, h, l, c, avg, flags, out_flags)
+    return out_flags
+
+
+@njit(cache=True, fastmath=_FASTMATH, boundscheck=False)
+def _measure_kernel(o, h, l, c, alpha, avg, flags):
+    # Ratio tests such as bodySize / candleSize * 100 <= 5 are written as
+    # cross-multiplies: a division in the loop body keeps LLVM from
+    # vectorizing it.
+    bh1 = bl1 = h1 = l1 = 0.0
+    for i in range(o.size):
+        bh   = max(c[i], o[i])
+        bl   = min(c[i], o[i])
+        body = bh - bl
+        tw   = h[i] - bh
+        bw   = bl - l[i]
+        rng  = h[i] - l[i]
+        avg[i] = body if i == 0 else alpha * body + (1.0 - alpha) * avg[i - 1]
+        a    = avg[i]
+
+        f = np.uint64(0)
+        if c[i] > o[i]:
+            f |= UP_CANDLE
+        if c[i] < o[i]:
+            f |= DWN_CANDLE
+        if body > a:
+            f |= TALL_BODY
+        if body < a:
+            f |= SHORT_BODY
+        doji_body = rng != 0.0 and body * 20.0 <= rng
+        if doji_body:
+            f |= BODY_IS_DOJI
+        if tw > 5 * _PCT * body:
+            f |= TOP_SHADOW
+        if bw > 5 * _PCT * body:
+            f |= BOTTOM_SHADOW
+        if i > 0:
+            if bh1 < bl:
+                f |= BODY_UP_GAP
+            if bh < bl1:
+                f |= BODY_DWN_GAP
+            if l[i] > h1:
+                f |= UP_GAP
+            if l1 > h[i]:
+                f |= DWN_GAP
+            if h[i] < h1 and l[i] > l1:
+                f |= _INSIDE_BAR
+
+        if doji_body and tw <= bw * 2.0 and bw <= tw * 2.0:
+            f |= _DOJI
+        if body > a and tw * 20.0 < body and bw * 20.0 < body:
+            if c[i] > o[i]:
+                f |= _MARU_BULL
+            if c[i] < o[i]:
+                f |= _MARU_BEAR
+        if rng * 5.0 > tw * 100.0:
+            f |= _SOLDIER_WICK
+        if rng * 5.0 > bw * 100.0:
+            f |= _CROW_WICK
+        flags[i] = f
+
+        bh1, bl1, h1, l1 = bh, bl, h[i], l[i]
+
+
+@njit(cache=True, inline="always")
+def _on(f, bits):
+    return (f & bits) == bits
+
+
+@njit(parallel=True, fastmath=_FASTMATH, boundscheck=False, cache=True)
+def _pattern_kernel(o, h, l, c, avg, flags, out):
+    for i in prange(o.size):
+        f0   = flags[i]
+        bh   = max(c[i], o[i])
+        bl   = min(c[i], o[i])
+        body = bh - bl
+        tw   = h[i] - bh
+        bw   = bl - l[i]
+        rng  = h[i] - l[i]
+        tol  = avg[i] * _TWEEZER_TOL
+        p    = np.uint64(0)
+
+        # Single-bar patterns
+        if _on(f0, _DOJI):
+            p |= PAT_DOJI
+        if body > 0.0 and bl >= (l[i] - h[i]) * (33 * _PCT) + h[i] and not _on(f0, TOP_SHADOW):
+            p |= PAT_HAMMER
+        if body > 0.0 and bh <= (h[i] - l[i]) * (33 * _PCT) + l[i] and not _on(f0, BOTTOM_SHADOW):
+            p |= PAT_STAR
+        if _on(f0, BODY_IS_DOJI):
+            if tw <= body:
+                p |= PAT_DRAGONFLY_DOJI
+            if bw <= body:
+                p |= PAT_GRAVESTONE_DOJI
+        if bw * 100.0 >= rng * 34.0 and tw * 100.0 >= rng * 34.0 and not _on(f0, BODY_IS_DOJI):
+            p |= PAT_SPINNING_TOP
+            if _on(f0, UP_CANDLE):
+                p |= PAT_SPINNING_TOP_BULL
+            if _on(f0, DWN_CANDLE):
+                p |= PAT_SPINNING_TOP_BEAR
+        if _on(f0, _MARU_BULL):
+            p |= PAT_MARUBULLZU
+        if _on(f0, _MARU_BEAR):
+            p |= PAT_MARUBEARZU
+        if bw * 100.0 > rng * 75.0:
+            p |= PAT_LLS
+        if tw * 100.0 > rng * 75.0:
+            p |= PAT_LUS
+
+        # Two-bar patterns
+        if i >= 1:
+            f1 = flags[i - 1]
+            inside1 = h[i] <= max(c[i - 1], o[i - 1]) and l[i] >= min(c[i - 1], o[i - 1])
+            tweezer = not _on(f0, BODY_IS_DOJI) or _on(f0, TOP_SHADOW | BOTTOM_SHADOW)
+            if c[i - 1] <= o[i - 1] and c[i] >= o[i - 1] and o[i] <= c[i - 1] and body > 0.0:
+                p |= PAT_BULL_ENGULF
+            if c[i - 1] >= o[i - 1] and c[i] <= o[i - 1] and o[i] >= c[i - 1] and body > 0.0:
+                p |= PAT_BEAR_ENGULF
+            if tweezer and abs(l[i] - l[i - 1]) <= tol and _on(f1, DWN_CANDLE | TALL_BODY) and _on(f0, UP_CANDLE):
+                p |= PAT_TWEEZER_BOTTOM
+            if tweezer and abs(h[i] - h[i - 1]) <= tol and _on(f1, UP_CANDLE | TALL_BODY) and _on(f0, DWN_CANDLE):
+                p |= PAT_TWEEZER_TOP
+            if _on(f1, TALL_BODY | DWN_CANDLE) and _on(f0, UP_CANDLE | SHORT_BODY) and inside1:
+                p |= PAT_HARAMI_BULL
+            if _on(f1, TALL_BODY | UP_CANDLE) and _on(f0, DWN_CANDLE | SHORT_BODY) and inside1:
+                p |= PAT_HARAMI_BEAR
+            if _on(f1, TALL_BODY | DWN_CANDLE) and _on(f0, BODY_IS_DOJI) and inside1:
+                p |= PAT_HARAMI_BULL_CROSS
+            if _on(f1, TALL_BODY | UP_CANDLE) and _on(f0, BODY_IS_DOJI) and inside1:
+                p |= PAT_HARAMI_BEAR_CROSS
+            bl1 = min(c[i - 1], o[i - 1])
+            mid1 = (max(c[i - 1], o[i - 1]) - bl1) * 0.5 + bl1
+            if _on(f1, DWN_CANDLE | TALL_BODY) and _on(f0, UP_CANDLE) and o[i] <= l[i - 1] and c[i] > mid1 and c[i] < o[i - 1]:
+                p |= PAT_PIERCING
+            if _on(f1, UP_CANDLE | TALL_BODY) and _on(f0, DWN_CANDLE) and o[i] >= h[i - 1] and c[i] < mid1 and c[i] > o[i - 1]:
+                p |= PAT_DARK_CLOUD_COVER
+            if rng != 0.0 and h[i - 1] - l[i - 1] != 0.0:
+                if l[i] > h[i - 1]:
+                    p |= PAT_RISING_WINDOW
+                if h[i] < l[i - 1]:
+                    p |= PAT_FALLING_WINDOW
+            if _on(f1, _MARU_BEAR) and _on(f0, _MARU_BULL | UP_GAP):
+                p |= PAT_KICKING_BULL
+            if _on(f1, _MARU_BULL) and _on(f0, _MARU_BEAR | DWN_GAP):
+                p |= PAT_KICKING_BEAR
+            if _on(f1, UP_CANDLE | TALL_BODY) and _on(f0, DWN_CANDLE | SHORT_BODY) and o[i] > c[i - 1] \
+                    and rng != 0.0 and abs(c[i] - h[i - 1]) <= tol:
+                p |= PAT_BULL_NECK
+            if _on(f1, DWN_CANDLE | TALL_BODY) and _on(f0, UP_CANDLE | SHORT_BODY) and o[i] < c[i - 1] \
+                    and rng != 0.0 and abs(c[i] - l[i - 1]) <= tol:
+                p |= PAT_BEAR_NECK
+            if _on(f0, _INSIDE_BAR):
+                p |= PAT_INSIDE_BAR
+                if _on(f1, _INSIDE_BAR):
+                    p |= PAT_DOUBLE_INSIDE
+
+        # Three-bar patterns
+        if i >= 2:
+            f1 = flags[i - 1]
+            f2 = flags[i - 2]
+            bh2 = max(c[i - 2], o[i - 2])
+            bl2 = min(c[i - 2], o[i - 2])
+            mid2 = (bh2 - bl2) * 0.5 + bl2
+            if _on(f2, TALL_BODY | DWN_CANDLE) and _on(f1, SHORT_BODY | BODY_DWN_GAP) \
+                    and _on(f0, TALL_BODY | UP_CANDLE | BODY_UP_GAP) and bh >= mid2 and bh < bh2:
+                p |= PAT_MORNING_STAR
+            if _on(f2, TALL_BODY | UP_CANDLE) and _on(f1, SHORT_BODY | BODY_UP_GAP) \
+                    and _on(f0, TALL_BODY | DWN_CANDLE | BODY_DWN_GAP) and bl <= mid2 and bl > bl2:
+                p |= PAT_EVENING_STAR
+            if _on(f2, DWN_CANDLE) and _on(f1, BODY_IS_DOJI | DWN_GAP) and _on(f0, UP_CANDLE | UP_GAP):
+                p |= PAT_ABANDONED_BULL
+            if _on(f2, UP_CANDLE) and _on(f1, BODY_IS_DOJI | UP_GAP) and _on(f0, DWN_CANDLE | DWN_GAP):
+                p |= PAT_ABANDONED_BEAR
+            if _on(f2, TALL_BODY | UP_CANDLE) and _on(f1, SHORT_BODY | UP_CANDLE | BODY_UP_GAP) and _on(f0, DWN_CANDLE) \
+                    and bl >= bh2 and bl <= min(c[i - 1], o[i - 1]):
+                p |= PAT_TASUKI_BULL
+            if _on(f2, TALL_BODY | DWN_CANDLE) and _on(f1, SHORT_BODY | DWN_CANDLE | BODY_DWN_GAP) and _on(f0, UP_CANDLE) \
+                    and bh <= bl2 and bh >= max(c[i - 1], o[i - 1]):
+                p |= PAT_TASUKI_BEAR
+            if _on(f0, TALL_BODY | UP_CANDLE | _SOLDIER_WICK) and _on(f1, TALL_BODY | UP_CANDLE | _SOLDIER_WICK) \
+                    and _on(f2, TALL_BODY | UP_CANDLE | _SOLDIER_WICK) and c[i] > c[i - 1] and c[i - 1] > c[i - 2] \
+                    and o[i] < c[i - 1] and o[i] > o[i - 1] and o[i - 1] < c[i - 2] and o[i - 1] > o[i - 2]:
+                p |= PAT_SOLDIERS
+            if _on(f0, TALL_BODY | DWN_CANDLE | _CROW_WICK) and _on(f1, TALL_BODY | DWN_CANDLE | _CROW_WICK) \
+                    and _on(f2, TALL_BODY | DWN_CANDLE | _CROW_WICK) and c[i] < c[i - 1] and c[i - 1] < c[i - 2] \
+                    and o[i] > c[i - 1] and o[i] < o[i - 1] and o[i - 1] > c[i - 2] and o[i - 1] < o[i - 2]:
+                p |= PAT_CROWS
+
+        # Four- and five-bar patterns
+        if i >= 3 and _on(f0, _DOJI) and _on(flags[i - 2], _DOJI) and _on(flags[i - 3], _DOJI):
+            if _on(flags[i - 1], BODY_DWN_GAP) and _on(f0, BODY_UP_GAP):
+                p |= PAT_TRI_STAR_BULL
+            if _on(f0, BODY_DWN_GAP) and _on(flags[i - 1], BODY_UP_GAP):
+                p |= PAT_TRI_STAR_BEAR
+        if i >= 4:
+            f4 = flags[i - 4]
+            if _on(f4, TALL_BODY | UP_CANDLE) and _on(f0, TALL_BODY | UP_CANDLE) and c[i] > c[i - 4]:
+                ok = True
+                for k in range(1, 4):
+                    ok = ok and _on(flags[i - k], SHORT_BODY | DWN_CANDLE) and o[i - k] < h[i - 4] and c[i - k] > l[i - 4]
+                if ok:
+                    p |= PAT_RISING_THREE
+            if _on(f4, TALL_BODY | DWN_CANDLE) and _on(f0, TALL_BODY | DWN_CANDLE) and c[i] < c[i - 4]:
+                ok = True
+                for k in range(1, 4):
+                    ok = ok and _on(flags[i - k], SHORT_BODY | UP_CANDLE) and o[i - k] > l[i - 4] and c[i - k] < h[i - 4]
+                if ok:
+                    p |= PAT_FALLING_THREE
+
+        out[i] = p
+
+
+# ================================== #
+# --------> Label Overlay <--------- #
+# ================================== #
+
+# Patterns fire on a small share of bars, so the label stage keeps each
+# pattern's hits as a packbits mask (1 bit per bar) and jumps straight to the
+# set bars instead of walking a bool per bar.
+
+def pack_pattern(patterns, bit):
+    """Packs the bars of a scan() result that have the PAT_* bit set, 1 bit per bar."""
+    return np.packbits((patterns & bit) != 0, bitorder="little")
+
+
+def set_bars(packed):
+    """Returns the bar indices set in a pack_pattern mask, skipping empty bytes."""
+    nz = np.flatnonzero(packed)
+    rows, cols = np.nonzero(np.unpackbits(packed[nz, None], axis=1, bitorder="little"))
+    return nz[rows] * 8 + cols
+
+
+# Pine's color.gray, the library's bull/bear colors and color.white.
+GRAY  = "#787B86"
+BLUE  = "#64b5f6"
+RED   = "#ef5350"
+WHITE = "#FFFFFF"
+
+Label = namedtuple("Label", "bar text yloc style color text_color tooltip")
+
+# One row per pattern replaces the *Lab functions of candlePatterns.py:
+# (text, yloc, style, label color, text color, tooltip).
+_LABELS = {
+    "doji"               : ("D"   , "belowbar", "label_up"  , GRAY , WHITE, "Doji\nTransitional candle signifying equality or indecision with a small or non-existent real body as the session closes at or near its open"),
+    "bull_engulf"        : ("BE"  , "belowbar", "label_up"  , BLUE , WHITE, "Bullish Engulfing\nAn up candle that closes higher than the previous day's opening after opening lower than the previous day's close"),
+    "bear_engulf"        : ("BE"  , "abovebar", "label_down", RED  , WHITE, "Bearish Engulfing\nA down candle that closes lower than the previous day's opening after opening higher than the previous day's close"),
+    "hammer"             : ("H"   , "belowbar", "label_up"  , BLUE , WHITE, "Hammer\nBullish bottoming candle comprised of a long lower wick and small real body typically closing at or near the highs"),
+    "star"               : ("SS"  , "abovebar", "label_down", RED  , WHITE, "Shooting Star\nBearish topping candle comprised of a long upper wick and small real body typically closing at or near the lows"),
+    "dragonfly_doji"     : ("DD"  , "belowbar", "label_up"  , BLUE , WHITE, "Dragonfly Doji\nThis bullish doji varietal is defined by an open and a close at or near the highs of the bar"),
+    "gravestone_doji"    : ("GD"  , "abovebar", "label_down", RED  , WHITE, "Gravestone Doji\nThis bearish doji varietal is defined by an open and a close at or near the lows of the bar"),
+    "tweezer_bottom"     : ("TB"  , "belowbar", "label_up"  , BLUE , WHITE, "Tweezer Bottom\nAn up candle following a down candle in a downtrend who's lows are nearly identical. The defence of the double bottom and a push to close green can show bulls are ready to fight back and can signal reversal"),
+    "tweezer_top"        : ("TT"  , "abovebar", "label_down", RED  , WHITE, "TweezerTop\nA down candle following an up candle in a uptrend who's highs are nearly identical. The defence of the double top and a push to close red can show bears are ready to fight back and can signal reversal"),
+    "spinning_top_bull"  : ("STW" , "belowbar", "label_up"  , GRAY , WHITE, "Bullish Spinning Top\nAn up candle defined by a short body surrounded by long wicks of approximately the same length as one another with each wick greater than the size of the body. Typical sign of indecision and possible reversal when observed at the swing low, or continuation sign if price breaks beyond the swing point"),
+    "spinning_top_bear"  : ("STB" , "belowbar", "label_up"  , GRAY , WHITE, "Bearish Spinning Top\nA down candle defined by a short body surrounded by long wicks of approximately the same length as one another with each wick greater than the size of the body. Typical sign of indecision and possible reversal when observed at the swing high, or continuation sign if price breaks beyond the swing point"),
+    "spinning_top"       : ("ST"  , "belowbar", "label_up"  , GRAY , WHITE, "Spinning Top\nA candle defined by a short body surrounded by long wicks of approximately the same length as one another with each wick greater than the size of the body. Typical sign of indecision and possible reversal when observed at the swing high/low, or continuation sign if price breaks above/below the candle low"),
+    "morning_star"       : ("MS"  , "belowbar", "label_up"  , BLUE , WHITE, "Bullish Morning Star\nThe morning star is a 3 bar bullish candlestick pattern that is formed during a downward trend. A small indecsion candle separates a first decisive down move, ending with a strong move in the opposite direction signaling possible reversal"),
+    "evening_star"       : ("ES"  , "abovebar", "label_down", RED  , WHITE, "Bearish Evening Star\nThe evening star is a 3 bar bullish candlestick pattern that is formed during an upward trend. A small indecsion candle separates a first decisive up move, ending with a strong move in the opposite direction signaling possible reversal"),
+    "harami_bull"        : ("HW"  , "belowbar", "label_up"  , BLUE , WHITE, "Bullish Harami\nThis 2 bar bullish pattern consists of a small-bodied green candle that is entirely encompassed within the body of what was once a red-bodied candle."),
+    "harami_bear"        : ("HB"  , "abovebar", "label_down", RED  , WHITE, "Bearish Harami\nThis 2 bar bearish pattern consists of a small-bodied red candle that is entirely encompassed within the body of what was once a green-bodied candle."),
+    "harami_bull_cross"  : ("HC"  , "belowbar", "label_up"  , BLUE , WHITE, "Bullish Harami Cross\nFound during a downtrend, this Harami variation consists of a Doji candle that is entirely encompassed within the body of what was once a red-bodied candle, signaling possible reversal"),
+    "harami_bear_cross"  : ("HC"  , "abovebar", "label_down", RED  , WHITE, "Bearish Harami Cross\nFound during an uptrend, this Harami variation consists of a Doji candle that is entirely encompassed within the body of what was once a green-bodied candle, signaling possible reversal"),
+    "marubullzu"         : ("MW"  , "belowbar", "label_up"  , BLUE , WHITE, "Bullish Marubozu\nA bullish candlestick that does not have a shadow that extends from its candle body at either the open or the close"),
+    "marubearzu"         : ("MB"  , "abovebar", "label_down", RED  , WHITE, "Bearish Marubozu\nA bearish candlestick that does not have a shadow that extends from its candle body at either the open or the close"),
+    "abandoned_bull"     : ("AB"  , "belowbar", "label_up"  , BLUE , WHITE, "Bullish Abandoned Baby\nA bullish reversal pattern where first is a large down candle, followed by a doji candle that gaps below the first candle. The next candle opens higher than the doji and moves aggressively to the upside."),
+    "abandoned_bear"     : ("AB"  , "abovebar", "label_down", RED  , WHITE, "Bearish Abandoned Baby\nA bearish reversal pattern where first is a large up candle, followed by a doji candle that gaps above the first candle. The next candle opens lower than the doji and moves aggressively to the downside."),
+    "piercing"           : ("P"   , "belowbar", "label_up"  , BLUE , WHITE, "Piercing\nA two-candle bullish reversal candlestick pattern found in a downtrend. The first candle is red and has a larger than average body. The second candle is green and opens below the low of the prior candle, creating a gap, and then closes above the midpoint of the first candle."),
+    "dark_cloud_cover"   : ("DCC" , "abovebar", "label_down", RED  , WHITE, "Dark Cloud Cover\nA two-candle bearish reversal candlestick pattern found in an uptrend. The first candle is green and has a larger than average body. The second candle is red and opens above the high of the prior candle, creating a gap, and then closes below the midpoint of the first candle."),
+    "tasuki_bull"        : ("UTG" , "belowbar", "label_up"  , BLUE , WHITE, "Upside Tasuki Gap\nA three-candle pattern found in an uptrend that usually hints at the continuation of the uptrend. The first candle is long and green, followed by a smaller green candle with its opening price that gaps above the body of the previous candle. The third candle is red and it closes inside the gap created by the first two candles, unable to close it fully."),
+    "tasuki_bear"        : ("DTG" , "abovebar", "label_down", RED  , WHITE, "Downside Tasuki Gap\nA three-candle pattern found in a downtrend that usually hints at the continuation of the downtrend. The first candle is long and red, followed by a smaller red candle with its opening price that gaps below the body of the previous candle. The third candle is green and it closes inside the gap created by the first two candles, unable to close it fully."),
+    "rising_three"       : ("RTM" , "belowbar", "label_up"  , BLUE , WHITE, "Rising Three Methods\nA five-candle bullish pattern that signifies a continuation of an existing uptrend. The first candle is long and green, followed by three short red candles with bodies inside the range of the first candle. The last candle is also green and long and it closes above the close of the first candle."),
+    "falling_three"      : ("FTM" , "abovebar", "label_down", RED  , WHITE, "FallingThree\nA five-candle bearish pattern that signifies a continuation of an existing downtrend. The first candle is long and red, followed by three short green candles with bodies inside the range of the first candle. The last candle is also red and long and it closes below the close of the first candle."),
+    "rising_window"      : ("RW"  , "belowbar", "label_up"  , BLUE , WHITE, "Rising Window\nA two-candle bullish continuation pattern that forms during an uptrend. The most important characteristic of the pattern is a price gap between the first candle's high and the second candle's low."),
+    "falling_window"     : ("FW"  , "abovebar", "label_down", RED  , WHITE, "Falling Window\nA two-candle bearish continuation pattern that forms during a downtrend. The most important characteristic of the pattern is a price gap between the first candle's low and the second candle's high."),
+    "kicking_bull"       : ("K"   , "belowbar", "label_up"  , BLUE , WHITE, "Kicking\nThe first day candlestick is a bearish marubozu candlestick with next to no upper or lower shadow and where the price opens at the day’s high and closes at the day’s low. The second day is a bullish marubozu pattern, with next to no upper or lower shadow and where the price opens at the day’s low and closes at the day’s high"),
+    "kicking_bear"       : ("K"   , "abovebar", "label_down", RED  , WHITE, "Kicking\nThe first day candlestick is a bullish marubozu candlestick with next to no upper or lower shadow and where the price opens at the day’s low and closes at the day’s high. The second day is a bearish marubozu pattern, with next to no upper or lower shadow and where the price opens at the day’s high and closes at the day’s low"),
+    "lls"                : ("LLS" , "belowbar", "label_up"  , BLUE , WHITE, "Long Lower Shadow\nTo indicate seller domination of the first part of a session, candlesticks will present with long lower shadows, as well as short upper shadows, which leaves sellers underwater by candles end"),
+    "lus"                : ("LUS" , "abovebar", "label_down", RED  , WHITE, "Long Upper Shadow\nTo indicate buyer domination of the first part of a session, candlesticks will present with long upper shadows, as well as short lower shadows, which leaves buyers underwater by candles end"),
+    "bull_neck"          : ("N"   , "belowbar", "label_up"  , BLUE , WHITE, "On Neck - Bullsih\nOn Neck is a two-line continuation pattern found in a uptrend. The first candle is long and green, the second candle is short and has a red body. The closing price of the second candle is close or equal to the first candle's high price. Hints at continuation of trend"),
+    "bear_neck"          : ("N"   , "abovebar", "label_down", RED  , WHITE, "On Neck - Bearish\nOn Neck is a two-line continuation pattern found in a downtrend. The first candle is long and red, the second candle is short and has a green body. The closing price of the second candle is close or equal to the first candle's low price. Hints at continuation of trend"),
+    "soldiers"           : ("3WS" , "belowbar", "label_up"  , BLUE , WHITE, "Three White Soldiers\nThis bullish reversal pattern is made up of three long-bodied, green candles in immediate succession. Each one opens within the body before it and the close is near to the high."),
+    "crows"              : ("3BC" , "abovebar", "label_down", RED  , WHITE, "Three Black Crows\nThis is a bearish reversal pattern that consists of three long, red-bodied candles in immediate succession. For each of these candles, each day opens within the body of the day before and closes either at or near its low."),
+    "tri_star_bull"      : ("3S"  , "belowbar", "label_up"  , BLUE , WHITE, "Tri-Star Bull\nA bullish TriStar pattern can form when three doji candlesticks materialize in immediate succession at the tail-end of an extended downtrend. The first doji candle marks indecision between bull and bear. The second doji gaps in the direction of the leading trend. The third changes the attitude of the market once the candlestick opens in the direction opposite to the trend."),
+    "tri_star_bear"      : ("3S"  , "abovebar", "label_down", RED  , WHITE, "Tri-Star Bear\nA bearish TriStar pattern can form when three doji candlesticks materialize in immediate succession at the tail-end of an extended uptrend. The first doji candle marks indecision between bull and bear. The second doji gaps in the direction of the leading trend. The third changes the attitude of the market once the candlestick opens in the direction opposite to the trend."),
+    "inside_bar"         : ("IB"  , "belowbar", "label_up"  , GRAY , WHITE, 'Inside Bar\nAn “inside bar” pattern is a two-bar price action trading strategy in which the inside bar is smaller and within the high to low range of the prior bar, i.e. the high is lower than the previous bar’s high, and the low is higher than the previous bar’s low.'),
+    "double_inside"      : ("DI"  , "belowbar", "label_up"  , GRAY , WHITE, "Double Inside Bar\nA 'Double Inside' pattern is a 3 bar pattern where 2 inside bars occur in a row. Often seen in consolidation or 'flag' patterns. The pattern typically favors continuation."),
+}
+
+
+def emit_label(kind, bar, show=False, detected=True):
+    """Produces the identifier label of pattern kind at bar, or None unless show and detected are true."""
+    if not (show and detected):
+        return None
+    return Label(bar, *_LABELS[kind])
+
+
+def emit_labels(kind, packed):
+    """Produces a label for every bar set in a pack_pattern mask of pattern kind."""
+    spec = _LABELS[kind]
+    return [Label(bar, *spec) for bar in set_bars(packed).tolist()]
@@ -0,0 +1,399 @@
+"""Parity tests of candlePatternsNp against a per-bar reference of candlePatterns.py.
+
+The references below are direct bar-by-bar transcriptions of the Pine
+measurements and detectors (na lookbacks never match), kept deliberately
+naive so they can be read side by side with the Pine source.
+"""
+
+import importlib.util
+import math
+import re
+import sys
+import unittest
+
+import numpy as np
+
+import candlePatternsNp as cp
+
+
+def measures(o, h, l, c):
+    """Returns the "Candle Measurements" block as {candle_measures key: [value per bar]}."""
+    n = len(o)
+    bh  = [max(c[i], o[i]) for i in range(n)]
+    bl  = [min(c[i], o[i]) for i in range(n)]
+    bs  = [abs(c[i] - o[i]) for i in range(n)]
+    avg = []
+    for i in range(n):
+        avg.append(bs[i] if i == 0 else 2 / 15 * bs[i] + (1 - 2 / 15) * avg[-1])
+    tw  = [abs(bh[i] - h[i]) for i in range(n)]
+    bw  = [abs(bl[i] - l[i]) for i in range(n)]
+    cs  = [abs(h[i] - l[i]) for i in range(n)]
+    pct = [bs[i] / cs[i] * 100 if cs[i] != 0 else math.nan for i in range(n)]
+    return {
+        "body_high":     bh,
+        "body_low":      bl,
+        "body_size":     bs,
+        "top_wick":      tw,
+        "bottom_wick":   bw,
+        "candle_size":   cs,
+        "body_avg":      avg,
+        "body_pcnt":     pct,
+        "middle_body":   [bs[i] / 2 + bl[i] for i in range(n)],
+        "tall_body":     [bs[i] > avg[i] for i in range(n)],
+        "short_body":    [bs[i] < avg[i] for i in range(n)],
+        "top_shadow":    [tw[i] > 5 / 100 * bs[i] for i in range(n)],
+        "bottom_shadow": [bw[i] > 5 / 100 * bs[i] for i in range(n)],
+        "body_is_doji":  [pct[i] <= 5 for i in range(n)],
+        "up_candle":     [c[i] > o[i] for i in range(n)],
+        "dwn_candle":    [c[i] < o[i] for i in range(n)],
+        "body_up_gap":   [i > 0 and bh[i - 1] < bl[i] for i in range(n)],
+        "body_dwn_gap":  [i > 0 and bh[i] < bl[i - 1] for i in range(n)],
+        "up_gap":        [i > 0 and l[i] > h[i - 1] for i in range(n)],
+        "dwn_gap":       [i > 0 and l[i - 1] > h[i] for i in range(n)],
+    }
+
+
+def reference(o, h, l, c):
+    """Returns {pattern name: [bool per bar]} for every name in cp.PATTERNS."""
+    n = len(o)
+    M = measures(o, h, l, c)
+    bh, bl, bs, tw, bw, cs = M["body_high"], M["body_low"], M["body_size"], M["top_wick"], M["bottom_wick"], M["candle_size"]
+    avg, mid, dj = M["body_avg"], M["middle_body"], M["body_is_doji"]
+    tall, short, tsh, bsh = M["tall_body"], M["short_body"], M["top_shadow"], M["bottom_shadow"]
+    up, dn = M["up_candle"], M["dwn_candle"]
+    bug, bdg, ug, dg = M["body_up_gap"], M["body_dwn_gap"], M["up_gap"], M["dwn_gap"]
+
+    def ratio(a, b):
+        if b == 0:
+            return math.inf if a > 0 else math.nan
+        return a / b
+
+    P = {}
+
+    def pat(name, k, f):
+        P[name] = [i >= k and bool(f(i)) for i in range(n)]
+
+    def inside_body(i):
+        return h[i] <= bh[i - 1] and l[i] >= bl[i - 1]
+
+    def tweezer(i):
+        return not dj[i] or (tsh[i] and bsh[i])
+
+    pat("doji",              0, lambda i: dj[i] and tw[i] <= bw[i] * 2 and bw[i] <= tw[i] * 2)
+    pat("bull_engulf",       1, lambda i: c[i - 1] <= o[i - 1] and c[i] >= o[i - 1] and o[i] <= c[i - 1] and bs[i] > 0)
+    pat("bear_engulf",       1, lambda i: c[i - 1] >= o[i - 1] and c[i] <= o[i - 1] and o[i] >= c[i - 1] and bs[i] > 0)
+    pat("hammer",            0, lambda i: bs[i] > 0 and bl[i] >= (l[i] - h[i]) * 0.33 + h[i] and not tsh[i])
+    pat("star",              0, lambda i: bs[i] > 0 and bh[i] <= (h[i] - l[i]) * 0.33 + l[i] and not bsh[i])
+    pat("dragonfly_doji",    0, lambda i: dj[i] and tw[i] <= bs[i])
+    pat("gravestone_doji",   0, lambda i: dj[i] and bw[i] <= bs[i])
+    pat("tweezer_bottom",    1, lambda i: tweezer(i) and abs(l[i] - l[i - 1]) <= avg[i] * 0.05 and dn[i - 1] and up[i] and tall[i - 1])
+    pat("tweezer_top",       1, lambda i: tweezer(i) and abs(h[i] - h[i - 1]) <= avg[i] * 0.05 and up[i - 1] and dn[i] and tall[i - 1])
+    pat("spinning_top",      0, lambda i: bw[i] >= cs[i] / 100 * 34 and tw[i] >= cs[i] / 100 * 34 and not dj[i])
+    spin = P["spinning_top"]
+    pat("spinning_top_bull", 0, lambda i: spin[i] and up[i])
+    pat("spinning_top_bear", 0, lambda i: spin[i] and dn[i])
+    pat("morning_star",      2, lambda i: tall[i - 2] and short[i - 1] and tall[i] and dn[i - 2] and bdg[i - 1] and up[i]
+                                          and bh[i] >= mid[i - 2] and bh[i] < bh[i - 2] and bug[i])
+    pat("evening_star",      2, lambda i: tall[i - 2] and short[i - 1] and tall[i] and up[i - 2] and bug[i - 1] and dn[i]
+                                          and bl[i] <= mid[i - 2] and bl[i] > bl[i - 2] and bdg[i])
+    pat("harami_bull",       1, lambda i: tall[i - 1] and dn[i - 1] and up[i] and short[i] and inside_body(i))
+    pat("harami_bear",       1, lambda i: tall[i - 1] and up[i - 1] and dn[i] and short[i] and inside_body(i))
+    pat("harami_bull_cross", 1, lambda i: tall[i - 1] and dn[i - 1] and dj[i] and inside_body(i))
+    pat("harami_bear_cross", 1, lambda i: tall[i - 1] and up[i - 1] and dj[i] and inside_body(i))
+    pat("marubullzu",        0, lambda i: up[i] and tall[i] and 5 > ratio(tw[i], bs[i]) * 100 and 5 > ratio(bw[i], bs[i]) * 100)
+    pat("marubearzu",        0, lambda i: dn[i] and tall[i] and 5 > ratio(tw[i], bs[i]) * 100 and 5 > ratio(bw[i], bs[i]) * 100)
+    pat("abandoned_bull",    2, lambda i: dn[i - 2] and dj[i - 1] and dg[i - 1] and up[i] and ug[i])
+    pat("abandoned_bear",    2, lambda i: up[i - 2] and dj[i - 1] and ug[i - 1] and dn[i] and dg[i])
+    pat("piercing",          1, lambda i: dn[i - 1] and tall[i - 1] and up[i] and o[i] <= l[i - 1] and c[i] > mid[i - 1] and c[i] < o[i - 1])
+    pat("dark_cloud_cover",  1, lambda i: up[i - 1] and tall[i - 1] and dn[i] and o[i] >= h[i - 1] and c[i] < mid[i - 1] and c[i] > o[i - 1])
+    pat("tasuki_bull",       2, lambda i: tall[i - 2] and short[i - 1] and up[i - 2] and bug[i - 1] and up[i - 1] and dn[i]
+                                          and bl[i] >= bh[i - 2] and bl[i] <= bl[i - 1])
+    pat("tasuki_bear",       2, lambda i: tall[i - 2] and short[i - 1] and dn[i - 2] and bdg[i - 1] and dn[i - 1] and up[i]
+                                          and bh[i] <= bl[i - 2] and bh[i] >= bh[i - 1])
+    pat("rising_three",      4, lambda i: tall[i - 4] and up[i - 4] and tall[i] and up[i] and c[i] > c[i - 4]
+                                          and all(short[i - k] and dn[i - k] and o[i - k] < h[i - 4] and c[i - k] > l[i - 4] for k in (1, 2, 3)))
+    pat("falling_three",     4, lambda i: tall[i - 4] and dn[i - 4] and tall[i] and dn[i] and c[i] < c[i - 4]
+                                          and all(short[i - k] and up[i - k] and o[i - k] > l[i - 4] and c[i - k] < h[i - 4] for k in (1, 2, 3)))
+    pat("rising_window",     1, lambda i: cs[i] != 0 and cs[i - 1] != 0 and l[i] > h[i - 1])
+    pat("falling_window",    1, lambda i: cs[i] != 0 and cs[i - 1] != 0 and h[i] < l[i - 1])
+    mw, mb = P["marubullzu"], P["marubearzu"]
+    pat("kicking_bull",      1, lambda i: mb[i - 1] and mw[i] and ug[i])
+    pat("kicking_bear",      1, lambda i: mw[i - 1] and mb[i] and dg[i])
+    pat("lls",               0, lambda i: bw[i] > cs[i] / 100 * 75)
+    pat("lus",               0, lambda i: tw[i] > cs[i] / 100 * 75)
+    pat("bull_neck",         1, lambda i: up[i - 1] and tall[i - 1] and dn[i] and o[i] > c[i - 1] and short[i] and cs[i] != 0
+                                          and abs(c[i] - h[i - 1]) <= avg[i] * 0.05)
+    pat("bear_neck",         1, lambda i: dn[i - 1] and tall[i - 1] and up[i] and o[i] < c[i - 1] and short[i] and cs[i] != 0
+                                          and abs(c[i] - l[i - 1]) <= avg[i] * 0.05)
+    sw = [cs[i] * 5 / 100 > tw[i] for i in range(n)]
+    cw = [cs[i] * 5 / 100 > bw[i] for i in range(n)]
+    pat("soldiers",          2, lambda i: all(tall[i - k] and up[i - k] and sw[i - k] for k in (0, 1, 2))
+                                          and c[i] > c[i - 1] and c[i - 1] > c[i - 2] and o[i] < c[i - 1] and o[i] > o[i - 1]
+                                          and o[i - 1] < c[i - 2] and o[i - 1] > o[i - 2])
+    pat("crows",             2, lambda i: all(tall[i - k] and dn[i - k] and cw[i - k] for k in (0, 1, 2))
+                                          and c[i] < c[i - 1] and c[i - 1] < c[i - 2] and o[i] > c[i - 1] and o[i] < o[i - 1]
+                                          and o[i - 1] > c[i - 2] and o[i - 1] < o[i - 2])
+    d = P["doji"]
+    pat("tri_star_bull",     3, lambda i: d[i] and d[i - 2] and d[i - 3] and bdg[i - 1] and bug[i])
+    pat("tri_star_bear",     3, lambda i: d[i] and d[i - 2] and d[i - 3] and bdg[i] and bug[i - 1])
+    pat("inside_bar",        1, lambda i: h[i] < h[i - 1] and l[i] > l[i - 1])
+    ib = P["inside_bar"]
+    pat("double_inside",     1, lambda i: ib[i] and ib[i - 1])
+    return P
+
+
+def random_bars(n, seed):
+    """Integer-tick OHLC with frequent ties, gaps and zero-range bars."""
+    rng = np.random.default_rng(seed)
+    o = np.cumsum(rng.choice([-3, -2, -1, 0, 1, 2, 3], n)).astype(float) + 1000
+    c = o + rng.choice([-4, -3, -1, 0, 1, 3, 4], n)
+    o[1:] = np.where(rng.random(n - 1) < 0.5, c[:-1] + rng.choice([-1, 0, 1], n - 1), o[1:])
+    h = np.maximum(o, c) + rng.integers(0, 3, n) * (rng.random(n) < 0.4)
+    l = np.minimum(o, c) - rng.integers(0, 3, n) * (rng.random(n) < 0.4)
+    return o, h, l, c
+
+
+def walk_bars(n, seed):
+    """Continuous random-walk OHLC with some wickless and flat-open bars."""
+    rng = np.random.default_rng(seed)
+    c = 100 + np.cumsum(rng.normal(0, 1, n))
+    o = c + rng.normal(0, 1, n)
+    o[::7] = c[::7]
+    h = np.maximum(o, c) + rng.exponential(0.5, n)
+    l = np.minimum(o, c) - rng.exponential(0.5, n)
+    h[::11] = np.maximum(o, c)[::11]
+    l[::13] = np.minimum(o, c)[::13]
+    return o, h, l, c
+
+
+def rare_bars():
+    """Hand-built bars that hit the patterns random data almost never forms."""
+    flat = (100, 101.5, 99.5, 101)
+    flat_doji = (100, 101, 99, 100)
+    bars = [flat] * 20
+    bars += [(100, 101, 97, 101), flat, (101, 104, 100, 100), flat]                             # hammer, star
+    bars += [flat_doji, flat_doji, (97, 98, 96, 97), flat_doji, flat]                           # tri-star bull
+    bars += [flat_doji, flat_doji, (103, 104, 102, 103), flat_doji, flat]                       # tri-star bear
+    bars += [flat] * 5 + [(100, 111, 99, 110), (108, 109, 105, 107), (107, 108, 104, 106),
+                          (106, 107, 103, 105), (106, 117, 105, 116)]                           # rising three
+    bars += [flat] * 5 + [(110, 111, 99, 100), (102, 105, 101, 103), (103, 106, 102, 104),
+                          (104, 107, 103, 105), (104, 105, 93, 94)]                             # falling three
+    o, h, l, c = (np.array(col, dtype=float) for col in zip(*bars))
+    return o, h, l, c
+
+
+def load_without_numba():
+    """Imports a fresh copy of candlePatternsNp with numba made unimportable."""
+    saved = sys.modules.get("numba")
+    sys.modules["numba"] = None
+    try:
+        spec = importlib.util.spec_from_file_location("candlePatternsNp_nojit", cp.__file__)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        if saved is None:
+            del sys.modules["numba"]
+        else:
+            sys.modules["numba"] = saved
+    return module
+
+
+# The vectorized detectors of candlePatternsNp, each named as in PATTERNS.
+VECTORIZED = [name for name in cp.PATTERNS if callable(getattr(cp, name, None))]
+
+
+class ParityCase(unittest.TestCase):
+
+    def assertScanMatches(self, module, o, h, l, c, expected=None):
+        expected = expected or reference(*(np.asarray(a, dtype=np.float64) for a in (o, h, l, c)))
+        words = module.scan(o, h, l, c)
+        for name in module.PATTERNS:
+            got = (words & getattr(module, "PAT_" + name.upper())) != 0
+            np.testing.assert_array_equal(got, expected[name], err_msg=name)
+
+    def assertDetectorsMatch(self, module, o, h, l, c):
+        expected = reference(*(np.asarray(a, dtype=np.float64) for a in (o, h, l, c)))
+        m = module.candle_measures(o, h, l, c)
+        for name in VECTORIZED:
+            np.testing.assert_array_equal(getattr(module, name)(m), expected[name], err_msg=name)
+
+
+class MeasuresTest(unittest.TestCase):
+
+    def test_candle_measures(self):
+        for bars in (random_bars(3000, 10), walk_bars(3000, 11)):
+            expected = measures(*bars)
+            m = cp.candle_measures(*bars)
+            for key, values in expected.items():
+                if m[key].dtype == np.bool_:
+                    np.testing.assert_array_equal(m[key], values, err_msg=key)
+                else:
+                    np.testing.assert_allclose(m[key], values, rtol=1e-12, atol=1e-12, err_msg=key)
+            for key in ("open", "high", "low", "close"):
+                self.assertIsNotNone(m[key])
+
+    def test_ema(self):
+        x = walk_bars(500, 12)[3]
+        expected = [x[0]]
+        for v in x[1:]:
+            expected.append(0.25 * v + 0.75 * expected[-1])
+        np.testing.assert_allclose(cp.ema(x, 0.25), expected, rtol=1e-12)
+        self.assertEqual(cp.ema(np.empty(0), 0.25).size, 0)
+
+    def test_pack_flags(self):
+        m = cp.candle_measures(*random_bars(3000, 13))
+        for key in ("up_candle", "dwn_candle", "tall_body", "short_body", "body_is_doji", "top_shadow",
+                    "bottom_shadow", "body_up_gap", "body_dwn_gap", "up_gap", "dwn_gap"):
+            np.testing.assert_array_equal((m["flags"] & getattr(cp, key.upper())) != 0, m[key], err_msg=key)
+
+
+class DetectorsTest(ParityCase):
+
+    def test_vectorized_detectors(self):
+        for bars in (random_bars(6000, 3), walk_bars(3000, 4), rare_bars()):
+            self.assertDetectorsMatch(cp, *bars)
+
+
+class ScanTest(ParityCase):
+
+    def test_scan(self):
+        hits = dict.fromkeys(cp.PATTERNS, 0)
+        for bars in (random_bars(6000, 1), walk_bars(3000, 2), rare_bars()):
+            expected = reference(*bars)
+            self.assertScanMatches(cp, *bars, expected=expected)
+            for name in cp.PATTERNS:
+                hits[name] += sum(expected[name])
+        # Parity only means something for patterns the data actually forms.
+        self.assertEqual([name for name, count in hits.items() if count == 0], [])
+
+    def test_without_numba(self):
+        module = load_without_numba()
+        self.assertIs(module.prange, range)
+        for bars in (random_bars(600, 6), rare_bars()):
+            self.assertScanMatches(module, *bars)
+            self.assertDetectorsMatch(module, *bars)
+
+    def test_short_inputs(self):
+        o, h, l, c = random_bars(8, 7)
+        for n in range(5):
+            bars = (o[:n], h[:n], l[:n], c[:n])
+            self.assertScanMatches(cp, *bars)
+            self.assertDetectorsMatch(cp, *bars)
+
+    def test_nan_gap(self):
+        # A missing bar is na in Pine, so no pattern may fire on or through it.
+        bars = walk_bars(500, 9)
+        for a in bars:
+            a[100:103] = np.nan
+        self.assertScanMatches(cp, *bars)
+        self.assertDetectorsMatch(cp, *bars)
+
+
+class LabelStageTest(unittest.TestCase):
+
+    def test_set_bars(self):
+        for n in (0, 1, 7, 8, 9, 3001):
+            words = cp.scan(*random_bars(max(n, 2), 14))[:n]
+            for name in cp.PATTERNS:
+                bit = getattr(cp, "PAT_" + name.upper())
+                np.testing.assert_array_equal(cp.set_bars(cp.pack_pattern(words, bit)),
+                                              np.flatnonzero(words & bit), err_msg=name)
+
+    def test_emit_label(self):
+        self.assertIsNone(cp.emit_label("doji", 7))
+        self.assertIsNone(cp.emit_label("doji", 7, show=True, detected=False))
+        self.assertIsNone(cp.emit_label("doji", 7, show=False, detected=True))
+        label = cp.emit_label("doji", 7, show=True)
+        self.assertIsInstance(label, cp.Label)
+        self.assertEqual((label.bar, label.text, label.yloc, label.style), (7, "D", "belowbar", "label_up"))
+
+    def test_emit_labels(self):
+        words = cp.scan(*random_bars(3000, 15))
+        for name in cp.PATTERNS:
+            packed = cp.pack_pattern(words, getattr(cp, "PAT_" + name.upper()))
+            labels = cp.emit_labels(name, packed)
+            self.assertEqual([label.bar for label in labels], cp.set_bars(packed).tolist(), name)
+            self.assertTrue(all(label == cp.emit_label(name, label.bar, show=True) for label in labels), name)
+
+    def test_tooltips_match_pine(self):
+        with open(cp.__file__.replace("candlePatternsNp.py", "candlePatterns.py"), encoding="utf-8") as f:
+            source = f.read()
+        tips = {m.group(1): m.group(3).replace("\\n", "\n")
+                for m in re.finditer(r"^const string (\w+)_TIP\s+= ([\"'])(.*)\2\s*$", source, re.M)}
+        for name in cp.PATTERNS:
+            label = cp.emit_label(name, 0, show=True)
+            self.assertEqual(label.tooltip, tips[name.upper()], name)
+
+
+class ParametersTest(unittest.TestCase):
+
+    def test_parameters(self):
+        o, h, l, c = random_bars(4000, 8)
+        m = cp.candle_measures(o, h, l, c)
+        bh, bl = np.maximum(c, o), np.minimum(c, o)
+        tw, bw, bs, cs = h - bh, bl - l, bh - bl, h - l
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pcnt = bs / cs * 100
+        for size, wick in ((5.0, 5.0), (10.0, 1.5)):
+            expected = (pcnt <= size) & (tw <= bw * wick) & (bw <= tw * wick)
+            np.testing.assert_array_equal(cp.doji(m, size, wick), expected)
+        for ratio, shadow in ((50, 10.0), (20, 0.0)):
+            expected = (bs > 0) & (bl >= (l - h) * (ratio / 100) + h) & ~(tw > shadow / 100 * bs)
+            np.testing.assert_array_equal(cp.hammer(m, ratio, shadow), expected)
+        for wick in (20, 45):
+            expected = (bw >= cs / 100 * wick) & (tw >= cs / 100 * wick) & ~(pcnt <= 5)
+            np.testing.assert_array_equal(cp.spinning_top(m, wick), expected)
+            np.testing.assert_array_equal(cp.spinning_top_bull(m, wick), expected & (c > o))
+            np.testing.assert_array_equal(cp.spinning_top_bear(m, wick), expected & (c < o))
+        for reject in (0.0, 50.0):
+            for engulf_wick in (False, True):
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    bull_ok = (tw / bs < reject / 100) if reject else np.ones_like(bs, dtype=bool)
+                    bear_ok = (bw / bs < reject / 100) if reject else np.ones_like(bs, dtype=bool)
+                bull = np.zeros(o.size, dtype=bool)
+                bear = np.zeros(o.size, dtype=bool)
+                bull[1:] = (c[:-1] <= o[:-1]) & (c[1:] >= o[:-1]) & (o[1:] <= c[:-1]) & bull_ok[1:] & (bs[1:] > 0)
+                bear[1:] = (c[:-1] >= o[:-1]) & (c[1:] <= o[:-1]) & (o[1:] >= c[:-1]) & bear_ok[1:] & (bs[1:] > 0)
+                if engulf_wick:
+                    bull[1:] &= c[1:] >= h[:-1]
+                    bear[1:] &= c[1:] <= l[:-1]
+                np.testing.assert_array_equal(cp.bull_engulf(m, reject, engulf_wick), bull)
+                np.testing.assert_array_equal(cp.bear_engulf(m, reject, engulf_wick), bear)
+
+
+class PriceStoreTest(ParityCase):
+
+    def test_float32(self):
+        # Integer ticks are exact in float32, so the float32 path must agree.
+        bars = cp.OHLC(*random_bars(6000, 5))
+        self.assertEqual(bars.o.dtype, np.float32)
+        self.assertScanMatches(cp, *bars)
+        self.assertDetectorsMatch(cp, *bars)
+        self.assertEqual(cp.candle_measures(*bars)["body_size"].dtype, np.float32)
+
+    def test_price_dtype(self):
+        self.assertEqual(cp.price_dtype(*random_bars(100, 16)), np.float32)
+        # float32 spacing near 1e6 is 0.0625, far coarser than a 0.01 range.
+        self.assertEqual(cp.price_dtype([1e6], [1e6 + 0.01], [1e6], [1e6]), np.float64)
+        self.assertEqual(cp.price_dtype([1e39], [1e39 + 1e33], [1e39], [1e39]), np.float64)
+        self.assertEqual(cp.price_dtype([5.0], [5.0], [5.0], [5.0]), np.float32)
+        self.assertEqual(cp.OHLC([1e6], [1e6 + 0.01], [1e6], [1e6]).o.dtype, np.float64)
+
+    def test_from_records(self):
+        Bar = type("Bar", (), {})
+        rows = []
+        for o, h, l, c in zip(*random_bars(50, 17)):
+            bar = Bar()
+            bar.open, bar.high, bar.low, bar.close = o, h, l, c
+            rows.append(bar)
+        bars = cp.OHLC.from_records(rows)
+        self.assertEqual(len(bars), 50)
+        for got, want in zip(bars, random_bars(50, 17)):
+            np.testing.assert_array_equal(got, want)
+        empty = cp.OHLC.from_records([])
+        self.assertEqual(len(empty), 0)
+        self.assertEqual(cp.scan(*empty).size, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()